@@ -2,6 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from fastapi import Request
 import os
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,6 +10,12 @@ load_dotenv()
 # URL de conexión clásica (síncrona) — usa psycopg2 por defecto
 DATABASE_URL = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
 
+
+def _json_dumps(value) -> str:
+    """Serializa columnas JSON/JSONB con orjson (en C). Admite claves no-str como json.dumps."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Crear el engine sincronico con configuración de pool
 engine = create_engine(
     DATABASE_URL,
@@ -17,6 +24,16 @@ engine = create_engine(
     max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),    # Conexiones extra bajo carga
     pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),    # Segundos de espera por conexión libre
     pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),  # Reciclar conexiones cada 30 min
+    # INSERT multi-fila: agrupa los executemany en VALUES (...), (...) de hasta N filas
+    # y el resto (UPDATE/DELETE) en execute_batch de psycopg2.
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=int(os.getenv("DB_INSERT_PAGE_SIZE", "1000")),
+    # LRU de sentencias compiladas (default 500): la app tiene bastantes más consultas
+    # distintas y, si no entran, se recompilan en cada request.
+    query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", "1200")),
+    # Payloads JSON/JSONB (auditoría, metadata, checklists) con orjson en vez de json
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
 )
 
 # Crear la sesión sincronica
@@ -6,7 +6,7 @@ from utils.datetime_utils import utcnow
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
@@ -90,8 +90,7 @@ class PlanSummary(BaseModel):
     max_usuarios: int
     activo: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SubscriptionSummary(BaseModel):
@@ -100,8 +99,7 @@ class SubscriptionSummary(BaseModel):
     fecha_proxima_renovacion: Optional[datetime] = None
     plan: Optional[PlanSummary] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TenantSummary(BaseModel):
@@ -124,8 +122,7 @@ class TenantSummary(BaseModel):
     usuarios_count: int = 0
     dias_restantes_demo: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TenantUpdate(BaseModel):
@@ -151,8 +148,7 @@ class UserSummary(BaseModel):
     es_super_admin: bool
     fecha_creacion: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DemoSummary(BaseModel):
@@ -165,8 +161,7 @@ class DemoSummary(BaseModel):
     dias_restantes_demo: Optional[int] = None
     activa: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class RoleSummary(BaseModel):
@@ -185,8 +180,7 @@ class PermissionSummary(BaseModel):
     descripcion: Optional[str] = None
     activo: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 @router.get("/tenants", response_model=List[TenantSummary])
@@ -307,7 +307,7 @@ def actualizar_perfil(
     Actualiza el perfil del usuario actual
     """
     try:
-        datos_update = datos.dict(exclude_unset=True)
+        datos_update = datos.model_dump(exclude_unset=True)
         
         # Los usuarios normales no pueden cambiar su propio rol
         if "rol" in datos_update and current_user.rol != "admin":
@@ -480,7 +480,7 @@ def actualizar_usuario(
                 detail="No tiene permisos para modificar este usuario"
             )
         
-        datos_update = datos.dict(exclude_unset=True)
+        datos_update = datos.model_dump(exclude_unset=True)
         
         # Verificar email único si se está cambiando
         if "email" in datos_update and datos_update["email"] != usuario.email:
@@ -36,7 +36,7 @@ router = APIRouter(prefix="/billing", tags=["Billing"])
 # ========== GET ENDPOINTS ==========
 
 @router.get("/planes", response_model=List[PlanResponse])
-async def get_available_planes(
+def get_available_planes(
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
 ):
@@ -97,7 +97,7 @@ def _expire_abandoned_checkouts(db: Session, subscription_id: int, hours: int =
 
 
 @router.get("/status", response_model=BillingStatusResponse)
-async def get_subscription_status(
+def get_subscription_status(
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
 ):
@@ -216,7 +216,7 @@ async def get_subscription_status(
 # ========== POST ENDPOINTS ==========
 
 @router.post("/upgrade", response_model=UpgradeResponse)
-async def upgrade_plan(
+def upgrade_plan(
     upgrade_data: UpgradePlanRequest,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
@@ -314,7 +314,7 @@ async def upgrade_plan(
 
 
 @router.post("/cancel", response_model=CancelSubscriptionResponse)
-async def cancel_subscription(
+def cancel_subscription(
     cancel_data: CancelSubscriptionRequest,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
@@ -430,7 +430,7 @@ async def cancel_subscription(
 # ========== PAGOS OFFLINE (transferencia / efectivo) ==========
 
 @router.get("/payment-instructions", response_model=PaymentInstructionsResponse)
-async def get_payment_instructions(
+def get_payment_instructions(
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
 ):
@@ -454,7 +454,7 @@ async def get_payment_instructions(
 
 
 @router.post("/report-offline-payment")
-async def report_offline_payment(
+def report_offline_payment(
     data: ReportOfflinePaymentRequest,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
@@ -593,7 +593,7 @@ def _get_plan_features(plan: Plan, permite_facturacion: bool, permite_reportes:
 # ========== STRIPE PAYMENT ENDPOINTS ==========
 
 @router.post("/payment-intent", response_model=PaymentIntentResponse)
-async def create_payment_intent(
+def create_payment_intent(
     request_data: PaymentIntentRequest,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
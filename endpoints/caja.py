@@ -22,7 +22,8 @@ from models.core import (
 )
 from schemas.caja import (
     TransactionCategoryCreate, TransactionCategoryUpdate, TransactionCategoryResponse,
-    TransactionCreate, TransactionResponse, TransactionAnnul, TransactionFilters,
+    TransactionCreate, TransactionResponse, TransactionResponseListAdapter,
+    TransactionAnnul, TransactionFilters,
     TransactionCreateAutomatic,
     CajaSummary, CajaSummaryByCategory,
     CashClosingCreate, CashClosingResponse,
@@ -34,6 +35,13 @@ from utils.logging_utils import log_event
 
 router = APIRouter(prefix="/caja", tags=["Caja"])
 
+# Columna del resumen de caja para cada método de pago; el resto cae en "otros"
+_METODO_RESUMEN = {
+    PaymentMethod.EFECTIVO: "efectivo",
+    PaymentMethod.TRANSFERENCIA: "transferencia",
+    PaymentMethod.TARJETA: "tarjeta",
+}
+
 
 def _fin_de_dia_si_es_medianoche(dt):
     """Si el datetime llega exactamente a medianoche (filtro por fecha sin hora, p.ej.
@@ -49,7 +57,7 @@ def _fin_de_dia_si_es_medianoche(dt):
 # ============================================================================
 
 @router.get("/categorias", response_model=List[TransactionCategoryResponse])
-async def get_categories(
+def get_categories(
     tipo: Optional[TransactionTypeEnum] = None,
     activo: Optional[bool] = None,
     current_user: Usuario = Depends(get_current_user),
@@ -91,7 +99,7 @@ async def get_categories(
 
 
 @router.post("/categorias", response_model=TransactionCategoryResponse, status_code=status.HTTP_201_CREATED)
-async def create_category(
+def create_category(
     category_data: TransactionCategoryCreate,
     current_user: Usuario = Depends(require_admin_or_manager),
     db: Session = Depends(conexion.get_db)
@@ -150,7 +158,7 @@ async def create_category(
 
 
 @router.patch("/categorias/{category_id}", response_model=TransactionCategoryResponse)
-async def update_category(
+def update_category(
     category_id: int,
     category_data: TransactionCategoryUpdate,
     current_user: Usuario = Depends(require_admin_or_manager),
@@ -221,7 +229,7 @@ async def update_category(
 
 
 @router.delete("/categorias/{category_id}")
-async def delete_category(
+def delete_category(
     category_id: int,
     current_user: Usuario = Depends(require_admin_or_manager),
     db: Session = Depends(conexion.get_db)
@@ -280,7 +288,7 @@ async def delete_category(
 # ============================================================================
 
 @router.get("/transacciones")
-async def get_transactions(
+def get_transactions(
     fecha_desde: Optional[datetime] = None,
     fecha_hasta: Optional[datetime] = None,
     tipo: Optional[TransactionTypeEnum] = None,
@@ -384,10 +392,10 @@ async def get_transactions(
                 "category_nombre": trans.category.nombre if trans.category else None,
                 "cliente_nombre": f"{trans.cliente.nombre} {trans.cliente.apellido}" if trans.cliente else None
             }
-            items.append(TransactionResponse(**trans_dict))
+            items.append(trans_dict)
 
         return {
-            "items": items,
+            "items": TransactionResponseListAdapter.validate_python(items),
             "total": total,
             "offset": offset,
             "limit": limit,
@@ -405,7 +413,7 @@ async def get_transactions(
 
 
 @router.get("/transacciones/{transaction_id}", response_model=TransactionResponse)
-async def get_transaction(
+def get_transaction(
     transaction_id: int,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
@@ -465,7 +473,7 @@ async def get_transaction(
 
 
 @router.post("/transacciones", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
-async def create_transaction(
+def create_transaction(
     transaction_data: TransactionCreate,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
@@ -582,7 +590,7 @@ async def create_transaction(
 
 
 @router.post("/transacciones/{transaction_id}/anular", response_model=TransactionResponse)
-async def annul_transaction(
+def annul_transaction(
     transaction_id: int,
     annul_data: TransactionAnnul,
     current_user: Usuario = Depends(require_admin_or_manager),
@@ -678,7 +686,7 @@ async def annul_transaction(
 # ============================================================================
 
 @router.get("/resumen", response_model=CajaSummary)
-async def get_caja_summary(
+def get_caja_summary(
     fecha_desde: Optional[datetime] = None,
     fecha_hasta: Optional[datetime] = None,
     current_user: Usuario = Depends(get_current_user),
@@ -704,75 +712,44 @@ async def get_caja_summary(
         else:
             fecha_hasta = _fin_de_dia_si_es_medianoche(fecha_hasta)
 
-        # Query base
-        transactions = db.query(Transaction).filter(
+        # Totales agrupados por (tipo, método) en SQL: a lo sumo una fila por
+        # combinación en vez de traer cada transacción del período
+        filas = db.query(
+            Transaction.tipo,
+            Transaction.metodo_pago,
+            func.sum(Transaction.monto),
+            func.count(Transaction.id),
+        ).filter(
             Transaction.empresa_usuario_id == current_user.empresa_usuario_id,
             Transaction.fecha >= fecha_desde,
             Transaction.fecha <= fecha_hasta,
             Transaction.anulada == False
-        ).all()
+        ).group_by(Transaction.tipo, Transaction.metodo_pago).all()
         
-        # Calcular totales
-        total_ingresos = Decimal("0.00")
-        total_egresos = Decimal("0.00")
-        
-        ingresos_efectivo = Decimal("0.00")
-        ingresos_transferencia = Decimal("0.00")
-        ingresos_tarjeta = Decimal("0.00")
-        ingresos_otros = Decimal("0.00")
-        
-        egresos_efectivo = Decimal("0.00")
-        egresos_transferencia = Decimal("0.00")
-        egresos_tarjeta = Decimal("0.00")
-        egresos_otros = Decimal("0.00")
+        # Desglose por método de pago: {"ingresos_efectivo": ..., "egresos_otros": ...}
+        desglose = {
+            f"{tipo}_{metodo}": Decimal("0.00")
+            for tipo in ("ingresos", "egresos")
+            for metodo in ("efectivo", "transferencia", "tarjeta", "otros")
+        }
+        cantidades = {"ingresos": 0, "egresos": 0}
         
-        cantidad_ingresos = 0
-        cantidad_egresos = 0
+        for tipo, metodo_pago, total, cantidad in filas:
+            clave_tipo = "ingresos" if tipo == TransactionType.INGRESO else "egresos"
+            desglose[f"{clave_tipo}_{_METODO_RESUMEN.get(metodo_pago, 'otros')}"] += total
+            cantidades[clave_tipo] += cantidad
         
-        for trans in transactions:
-            if trans.tipo == TransactionType.INGRESO:
-                total_ingresos += trans.monto
-                cantidad_ingresos += 1
-                
-                if trans.metodo_pago == PaymentMethod.EFECTIVO:
-                    ingresos_efectivo += trans.monto
-                elif trans.metodo_pago == PaymentMethod.TRANSFERENCIA:
-                    ingresos_transferencia += trans.monto
-                elif trans.metodo_pago == PaymentMethod.TARJETA:
-                    ingresos_tarjeta += trans.monto
-                else:
-                    ingresos_otros += trans.monto
-            else:
-                total_egresos += trans.monto
-                cantidad_egresos += 1
-                
-                if trans.metodo_pago == PaymentMethod.EFECTIVO:
-                    egresos_efectivo += trans.monto
-                elif trans.metodo_pago == PaymentMethod.TRANSFERENCIA:
-                    egresos_transferencia += trans.monto
-                elif trans.metodo_pago == PaymentMethod.TARJETA:
-                    egresos_tarjeta += trans.monto
-                else:
-                    egresos_otros += trans.monto
-        
-        saldo = total_ingresos - total_egresos
-        efectivo_caja = ingresos_efectivo - egresos_efectivo
+        total_ingresos = sum((v for k, v in desglose.items() if k.startswith("ingresos_")), Decimal("0.00"))
+        total_egresos = sum((v for k, v in desglose.items() if k.startswith("egresos_")), Decimal("0.00"))
         
         return CajaSummary(
             total_ingresos=total_ingresos,
             total_egresos=total_egresos,
-            saldo=saldo,
-            efectivo_caja=efectivo_caja,
-            ingresos_efectivo=ingresos_efectivo,
-            ingresos_transferencia=ingresos_transferencia,
-            ingresos_tarjeta=ingresos_tarjeta,
-            ingresos_otros=ingresos_otros,
-            egresos_efectivo=egresos_efectivo,
-            egresos_transferencia=egresos_transferencia,
-            egresos_tarjeta=egresos_tarjeta,
-            egresos_otros=egresos_otros,
-            cantidad_ingresos=cantidad_ingresos,
-            cantidad_egresos=cantidad_egresos,
+            saldo=total_ingresos - total_egresos,
+            efectivo_caja=desglose["ingresos_efectivo"] - desglose["egresos_efectivo"],
+            **desglose,
+            cantidad_ingresos=cantidades["ingresos"],
+            cantidad_egresos=cantidades["egresos"],
             fecha_desde=fecha_desde,
             fecha_hasta=fecha_hasta
         )
@@ -788,7 +765,7 @@ async def get_caja_summary(
 
 
 @router.get("/resumen/por-categoria", response_model=List[CajaSummaryByCategory])
-async def get_summary_by_category(
+def get_summary_by_category(
     fecha_desde: Optional[datetime] = None,
     fecha_hasta: Optional[datetime] = None,
     tipo: Optional[TransactionTypeEnum] = None,
@@ -867,7 +844,7 @@ async def get_summary_by_category(
 # ============================================================================
 
 @router.post("/cierres", response_model=CashClosingResponse, status_code=status.HTTP_201_CREATED)
-async def create_cash_closing(
+def create_cash_closing(
     closing_data: CashClosingCreate,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
@@ -977,7 +954,7 @@ async def create_cash_closing(
 
 
 @router.get("/cierres", response_model=List[CashClosingResponse])
-async def get_cash_closings(
+def get_cash_closings(
     fecha_desde: Optional[datetime] = None,
     fecha_hasta: Optional[datetime] = None,
     usuario_id: Optional[int] = None,
@@ -1035,7 +1012,7 @@ async def get_cash_closings(
 # ============================================================================
 
 @router.get("/transacciones/exportar/csv")
-async def export_transactions_csv(
+def export_transactions_csv(
     fecha_desde: Optional[datetime] = None,
     fecha_hasta: Optional[datetime] = None,
     tipo: Optional[TransactionTypeEnum] = None,
@@ -1061,7 +1038,19 @@ async def export_transactions_csv(
         else:
             fecha_hasta = _fin_de_dia_si_es_medianoche(fecha_hasta)
 
-        query = db.query(Transaction).filter(
+        # Solo las columnas del CSV, con categoría y usuario por JOIN: sin instanciar
+        # objetos ORM ni un lazy load de category/usuario por fila
+        query = db.query(
+            Transaction.id, Transaction.fecha, Transaction.tipo,
+            TransactionCategory.nombre.label("category_nombre"),
+            Transaction.monto, Transaction.metodo_pago, Transaction.referencia,
+            Usuario.username, Transaction.notas, Transaction.anulada,
+            Transaction.motivo_anulacion,
+        ).outerjoin(
+            TransactionCategory, TransactionCategory.id == Transaction.category_id
+        ).outerjoin(
+            Usuario, Usuario.id == Transaction.usuario_id
+        ).filter(
             Transaction.empresa_usuario_id == current_user.empresa_usuario_id,
             Transaction.fecha >= fecha_desde,
             Transaction.fecha <= fecha_hasta
@@ -1083,20 +1072,22 @@ async def export_transactions_csv(
         ])
         
         # Filas
-        for trans in transactions:
-            writer.writerow([
+        writer.writerows(
+            [
                 trans.id,
                 trans.fecha.strftime("%Y-%m-%d %H:%M:%S"),
                 trans.tipo.value,
-                trans.category.nombre if trans.category else "",
+                trans.category_nombre or "",
                 str(trans.monto),
                 trans.metodo_pago.value,
                 trans.referencia or "",
-                trans.usuario.username if trans.usuario else "",
+                trans.username or "",
                 trans.notas or "",
                 "Sí" if trans.anulada else "No",
                 trans.motivo_anulacion or ""
-            ])
+            ]
+            for trans in transactions
+        )
         
         output.seek(0)
         
@@ -1171,7 +1162,7 @@ async def create_automatic_transaction(
 # ============================================================================
 
 @router.get("/stays/{stay_id}/transactions", response_model=List[TransactionResponse])
-async def get_stay_transactions(
+def get_stay_transactions(
     stay_id: int,
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(conexion.get_db)
@@ -1223,9 +1214,9 @@ async def get_stay_transactions(
                 "category_nombre": t.category.nombre if t.category else None,
                 "cliente_nombre": f"{t.cliente.nombre} {t.cliente.apellido}" if t.cliente else None
             }
-            result.append(TransactionResponse(**trans_dict))
+            result.append(trans_dict)
         
-        return result
+        return TransactionResponseListAdapter.validate_python(result)
         
     except HTTPException:
         raise
@@ -3,11 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, func
 from sqlalchemy.exc import IntegrityError
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from datetime import datetime, date
 
 from database.conexion import get_db
-from models.core import Cliente, Stay, StayCharge, StayPayment, Room, RoomType, Reservation, StayRoomOccupancy
+from models.core import Cliente, Stay, StayCharge, Room, RoomType, Reservation, StayRoomOccupancy
 from utils.dependencies import get_current_user
 from utils.logging_utils import log_event
 
@@ -46,8 +46,7 @@ class ClienteUpdate(BaseModel):
 class ClienteRead(ClienteBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # --- Endpoints ---
 
@@ -148,7 +147,7 @@ def create_cliente(cliente: ClienteCreate, db: Session = Depends(get_db), curren
     if existing:
         raise HTTPException(status_code=400, detail="Ya existe un cliente con ese documento")
 
-    db_cliente = Cliente(**cliente.dict(), empresa_usuario_id=tenant_id)
+    db_cliente = Cliente(**cliente.model_dump(), empresa_usuario_id=tenant_id)
     db.add(db_cliente)
     try:
         db.commit()
@@ -170,7 +169,7 @@ def update_cliente(cliente_id: int, cliente_update: ClienteUpdate, db: Session =
     if not db_cliente:
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
 
-    update_data = cliente_update.dict(exclude_unset=True)
+    update_data = cliente_update.model_dump(exclude_unset=True)
     
     # Si cambia documento, validar duplicado
     if "numero_documento" in update_data and update_data["numero_documento"] != db_cliente.numero_documento:
@@ -320,11 +319,8 @@ def get_cliente_perfil(
                 StayCharge.stay_id == stay.id
             ).scalar() or 0
             
-            # Calcular total pagado (excluyendo reversos)
-            total_pagado = db.query(func.sum(StayPayment.monto)).filter(
-                StayPayment.stay_id == stay.id,
-                StayPayment.es_reverso == False
-            ).scalar() or 0
+            # Total pagado (excluyendo reversos), desnormalizado en la estadía
+            total_pagado = stay.monto_pagado or 0
             
             # Obtener información de la habitación desde occupancy
             occupancy = db.query(StayRoomOccupancy).filter(
@@ -5,13 +5,13 @@ Gestión de empresas (clientes corporativos)
 from typing import List, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import or_, and_, func, select
 from sqlalchemy.exc import IntegrityError
-from pydantic import BaseModel, Field, field_serializer, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_serializer
 
 from database.conexion import get_db
-from models.core import ClienteCorporativo, Reservation, Stay, StayCharge, Room, RoomType
+from models.core import ClienteCorporativo, Reservation, ReservationRoom, ReservationGuest, Stay, StayCharge, Room, RoomType
 from utils.dependencies import get_current_user, require_admin_or_manager
 
 router = APIRouter(prefix="/empresas", tags=["Empresas"])
@@ -52,8 +52,7 @@ class EmpresaRead(EmpresaBase):
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
     @field_serializer('created_at')
     def serialize_created_at(self, value: datetime) -> str:
@@ -358,10 +357,7 @@ def get_empresa_detalles(
     
     for stay in stays_con_cargos:
         # Total pagado para toda la estancia
-        stay_total_pagado = sum(
-            float(p.monto) for p in stay.payments
-            if not p.es_reverso
-        )
+        stay_total_pagado = float(stay.monto_pagado or 0)
         # Total de cargos de la estancia (para calcular proporción)
         stay_total_cargos = sum(float(c.monto_total or 0) for c in stay.charges) or 1
 
@@ -383,12 +379,37 @@ def get_empresa_detalles(
     # Obtener reservaciones activas
     reservaciones_list = []
     
-    reservas = db.query(Reservation).filter(
+    reservas = db.query(Reservation).options(
+        joinedload(Reservation.cliente),
+        selectinload(Reservation.guests).joinedload(ReservationGuest.cliente),
+        selectinload(Reservation.rooms).joinedload(ReservationRoom.room),
+    ).filter(
         Reservation.empresa_id == empresa_id,
         Reservation.empresa_usuario_id == tenant_id,
         Reservation.estado.in_(["confirmada", "ocupada", "draft"])
     ).all()
-    
+
+    # Resumen de saldo por reserva en una sola query (una estadía por reserva:
+    # uq_stay_reservation): cargos por subconsulta correlacionada + monto_pagado.
+    cargos_stay = (
+        select(func.coalesce(func.sum(StayCharge.monto_total), 0))
+        .where(StayCharge.stay_id == Stay.id)
+        .correlate(Stay)
+        .scalar_subquery()
+    )
+    saldos_por_reserva = {
+        row.reservation_id: row
+        for row in db.query(
+            Stay.reservation_id,
+            Stay.id.label("stay_id"),
+            cargos_stay.label("cargos"),
+            Stay.monto_pagado,
+        ).filter(
+            Stay.reservation_id.in_([r.id for r in reservas]),
+            Stay.empresa_usuario_id == tenant_id,
+        ).all()
+    } if reservas else {}
+
     for res in reservas:
         # Obtener huésped: priorizar titular de la reserva, luego primer huésped con cliente
         huesped_nombre = None
@@ -406,19 +427,11 @@ def get_empresa_detalles(
             first_room = res.rooms[0].room if res.rooms[0].room else None
             habitacion_numero = getattr(first_room, "numero", None)
         
-        # Calcular monto, pagado y pendiente sumando cargos y pagos de las stays de la reserva
-        monto_total = 0
-        pagado_total = 0
-        stay_id_principal = None
-        stays_reserva = db.query(Stay).filter(
-            Stay.reservation_id == res.id,
-            Stay.empresa_usuario_id == tenant_id
-        ).all()
-        for stay in stays_reserva:
-            if stay_id_principal is None:
-                stay_id_principal = stay.id  # Usar la primera estadía encontrada
-            monto_total += sum(float(c.monto_total or 0) for c in stay.charges)
-            pagado_total += sum(float(p.monto or 0) for p in stay.payments if not p.es_reverso)
+        # Monto, pagado y pendiente de la estadía de la reserva (si ya tiene)
+        saldo = saldos_por_reserva.get(res.id)
+        stay_id_principal = saldo.stay_id if saldo else None
+        monto_total = float(saldo.cargos or 0) if saldo else 0
+        pagado_total = float(saldo.monto_pagado or 0) if saldo else 0
 
         pendiente_total = round(monto_total - pagado_total, 2)
 
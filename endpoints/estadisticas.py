@@ -2,7 +2,7 @@
 Estadísticas y Dashboard
 Datos para dashboards administrativos
 """
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, time
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
@@ -17,6 +17,7 @@ from models.core import (
 )
 from models.usuario import Usuario
 from utils.dependencies import get_current_user
+from utils.audit import registrar_auditoria
 
 router = APIRouter(prefix="/estadisticas", tags=["Estadísticas"])
 
@@ -61,6 +62,11 @@ class TasaOcupacionPeriodo(dict):
     dias_datos: int
 
 
+def _desde_dia(d: date) -> datetime:
+    """Inicio del día (naive: la base lo interpreta en su zona, igual que func.date())."""
+    return datetime.combine(d, time.min)
+
+
 # --- Endpoints ---
 
 @router.get("/hoy")
@@ -114,7 +120,8 @@ def get_estadisticas_hoy(
         func.coalesce(func.sum(StayPayment.monto), 0)
     ).join(Stay).filter(
         Stay.empresa_usuario_id == tenant_id,
-        func.date(StayPayment.timestamp) == hoy,
+        StayPayment.timestamp >= _desde_dia(hoy),
+        StayPayment.timestamp < _desde_dia(hoy + timedelta(days=1)),
         StayPayment.es_reverso == False
     ).scalar() or 0
 
@@ -201,7 +208,8 @@ def get_ingresos_ultimos_dias(
             func.coalesce(func.sum(StayPayment.monto), 0)
         ).join(Stay).filter(
             Stay.empresa_usuario_id == tenant_id,
-            func.date(StayPayment.timestamp) == fecha_check,
+            StayPayment.timestamp >= _desde_dia(fecha_check),
+            StayPayment.timestamp < _desde_dia(fecha_check + timedelta(days=1)),
             StayPayment.es_reverso == False
         ).scalar() or 0
 
@@ -242,8 +250,8 @@ def get_resumen_mes_actual(
         func.coalesce(func.sum(StayPayment.monto), 0)
     ).join(Stay).filter(
         Stay.empresa_usuario_id == tenant_id,
-        func.date(StayPayment.timestamp) >= primer_dia_mes,
-        func.date(StayPayment.timestamp) <= ultimo_dia_mes,
+        StayPayment.timestamp >= _desde_dia(primer_dia_mes),
+        StayPayment.timestamp < _desde_dia(ultimo_dia_mes.date() + timedelta(days=1)),
         StayPayment.es_reverso == False
     ).scalar() or 0
 
@@ -366,16 +374,24 @@ def get_actividad_reciente(
     """Actividad reciente del sistema"""
     tenant_id = current_user.empresa_usuario_id
     
-    # Obtener usuarios de la misma empresa para filtrar eventos
-    usuarios_empresa = db.query(Usuario.username).filter(
+    # Usuarios de la misma empresa (subconsulta) para filtrar eventos
+    usernames = db.query(Usuario.username).filter(
         Usuario.empresa_usuario_id == tenant_id
-    ).all()
-    usernames = [u.username for u in usuarios_empresa]
-    
-    eventos = db.query(AuditEvent).filter(
-        AuditEvent.usuario.in_(usernames)
+    )
+
+    # Solo las columnas que se devuelven: no se construyen entidades ni se
+    # decodifica el payload JSONB de cada evento.
+    eventos = db.query(
+        AuditEvent.timestamp,
+        AuditEvent.usuario,
+        AuditEvent.action,
+        AuditEvent.entity_type,
+        AuditEvent.descripcion,
+    ).filter(
+        AuditEvent.usuario.in_(usernames.scalar_subquery())
     ).order_by(
-        AuditEvent.timestamp.desc()
+        AuditEvent.timestamp.desc(),
+        AuditEvent.id.desc()
     ).limit(limite).all()
 
     return {
@@ -505,11 +521,9 @@ def get_deudores(
 
     pagos_cli_sq = db.query(
         Reservation.cliente_id.label("cliente_id"),
-        func.coalesce(func.sum(StayPayment.monto), 0).label("total_pagado"),
+        func.coalesce(func.sum(Stay.monto_pagado), 0).label("total_pagado"),
     ).join(
         Stay, Stay.reservation_id == Reservation.id
-    ).join(
-        StayPayment, (StayPayment.stay_id == Stay.id) & (StayPayment.es_reverso == False)
     ).filter(
         Reservation.cliente_id.isnot(None)
     ).group_by(Reservation.cliente_id).subquery()
@@ -559,11 +573,9 @@ def get_deudores(
 
     pagos_emp_sq = db.query(
         Reservation.empresa_id.label("empresa_id"),
-        func.coalesce(func.sum(StayPayment.monto), 0).label("total_pagado"),
+        func.coalesce(func.sum(Stay.monto_pagado), 0).label("total_pagado"),
     ).join(
         Stay, Stay.reservation_id == Reservation.id
-    ).join(
-        StayPayment, (StayPayment.stay_id == Stay.id) & (StayPayment.es_reverso == False)
     ).filter(
         Reservation.empresa_id.isnot(None)
     ).group_by(Reservation.empresa_id).subquery()
@@ -677,7 +689,8 @@ def registrar_pago_deudor(
     db.add(payment)
 
     # Auditoría
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay.id,
         action="PAYMENT_FROM_DEUDORES",
@@ -690,7 +703,6 @@ def registrar_pago_deudor(
             "deudor_id": data.deudor_id
         }
     )
-    db.add(audit)
     
     db.commit()
     
@@ -1,13 +1,13 @@
 ﻿"""
 Endpoints para gestión de Habitaciones y Tipos de Habitaciones
 """
-from typing import List, Optional
+from typing import Annotated, List, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, func
 from sqlalchemy.exc import IntegrityError
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, StringConstraints, field_validator
 
 from database import conexion
 from models.core import Room, RoomType, Reservation, ReservationRoom, Stay, StayRoomOccupancy
@@ -20,8 +20,29 @@ router = APIRouter(prefix="/api/rooms", tags=["rooms"])
 _ESTADOS_OPERATIVOS = {"disponible", "ocupada", "mantenimiento", "fuera_de_servicio", "bloqueada"}
 
 
+def _normalizar_numero(v: str) -> str:
+    # Normalizar: eliminar espacios internos múltiples, uppercase
+    return " ".join(v.split()).upper()
+
+
+def _validar_estado(v: str) -> str:
+    if v not in _ESTADOS_OPERATIVOS:
+        raise ValueError(
+            f"estado_operativo debe ser uno de: {', '.join(sorted(_ESTADOS_OPERATIVOS))}"
+        )
+    return v
+
+
+# Tipos compartidos por los schemas Create/Update (con Optional[...] el None no pasa por el validador)
+_NumeroHabitacion = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1, max_length=20), AfterValidator(_normalizar_numero)
+]
+_EstadoOperativo = Annotated[str, AfterValidator(_validar_estado)]
+_NombreTipo = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
+
+
 class RoomTypeCreate(BaseModel):
-    nombre: str = Field(..., min_length=1, max_length=100, strip_whitespace=True)
+    nombre: _NombreTipo
     descripcion: Optional[str] = Field(None, max_length=500)
     capacidad: int = Field(..., ge=1, le=100)
     precio_base: Optional[float] = Field(None, ge=0)
@@ -37,7 +58,7 @@ class RoomTypeCreate(BaseModel):
 
 
 class RoomTypeUpdate(BaseModel):
-    nombre: Optional[str] = Field(None, min_length=1, max_length=100, strip_whitespace=True)
+    nombre: Optional[_NombreTipo] = None
     descripcion: Optional[str] = Field(None, max_length=500)
     capacidad: Optional[int] = Field(None, ge=1, le=100)
     precio_base: Optional[float] = Field(None, ge=0)
@@ -53,59 +74,27 @@ class RoomTypeRead(BaseModel):
     amenidades: Optional[List[str]] = None
     activo: bool
     cantidad_habitaciones: int = 0
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class RoomCreate(BaseModel):
-    numero: str = Field(..., min_length=1, max_length=20, strip_whitespace=True)
+    numero: _NumeroHabitacion
     room_type_id: int = Field(..., gt=0)
-    estado_operativo: str = Field(default="disponible")
+    estado_operativo: _EstadoOperativo = "disponible"
     piso: Optional[int] = Field(None, ge=0, le=200)
     notas: Optional[str] = Field(None, max_length=1000)
     particularidades: Optional[dict] = None
     activo: bool = True
 
-    @field_validator("numero")
-    @classmethod
-    def normalizar_numero(cls, v):
-        # Normalizar: eliminar espacios internos múltiples, uppercase
-        return " ".join(v.split()).upper()
-
-    @field_validator("estado_operativo")
-    @classmethod
-    def validar_estado(cls, v):
-        if v not in _ESTADOS_OPERATIVOS:
-            raise ValueError(
-                f"estado_operativo debe ser uno de: {', '.join(sorted(_ESTADOS_OPERATIVOS))}"
-            )
-        return v
-
 
 class RoomUpdate(BaseModel):
-    numero: Optional[str] = Field(None, min_length=1, max_length=20, strip_whitespace=True)
+    numero: Optional[_NumeroHabitacion] = None
     room_type_id: Optional[int] = Field(None, gt=0)
-    estado_operativo: Optional[str] = None
+    estado_operativo: Optional[_EstadoOperativo] = None
     piso: Optional[int] = Field(None, ge=0, le=200)
     notas: Optional[str] = Field(None, max_length=1000)
     particularidades: Optional[dict] = None
     activo: Optional[bool] = None
 
-    @field_validator("numero")
-    @classmethod
-    def normalizar_numero(cls, v):
-        if v is not None:
-            return " ".join(v.split()).upper()
-        return v
-
-    @field_validator("estado_operativo")
-    @classmethod
-    def validar_estado(cls, v):
-        if v is not None and v not in _ESTADOS_OPERATIVOS:
-            raise ValueError(
-                f"estado_operativo debe ser uno de: {', '.join(sorted(_ESTADOS_OPERATIVOS))}"
-            )
-        return v
-
 class RoomRead(BaseModel):
     id: int
     numero: str
@@ -119,12 +108,11 @@ class RoomRead(BaseModel):
     updated_at: datetime
     tipo_nombre: Optional[str] = None
     capacidad: Optional[int] = None
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Room Types Endpoints
 @router.get("/types", response_model=List[RoomTypeRead])
-async def list_room_types(
+def list_room_types(
     db: Session = Depends(conexion.get_db),
     current_user = Depends(get_current_user)
 ):
@@ -153,7 +141,7 @@ async def list_room_types(
     return result
 
 @router.post("/types", response_model=RoomTypeRead, status_code=status.HTTP_201_CREATED)
-async def create_room_type(
+def create_room_type(
     room_type: RoomTypeCreate,
     db: Session = Depends(conexion.get_db),
     current_user = Depends(require_admin_or_manager)
@@ -162,7 +150,7 @@ async def create_room_type(
         raise HTTPException(status_code=401, detail="No autenticado o sin tenant asociado")
     
     tenant_id = current_user.empresa_usuario_id
-    nueva = RoomType(**room_type.dict(), empresa_usuario_id=tenant_id)
+    nueva = RoomType(**room_type.model_dump(), empresa_usuario_id=tenant_id)
     db.add(nueva)
     try:
         db.commit()
@@ -170,13 +158,13 @@ async def create_room_type(
         db.rollback()
         raise HTTPException(status_code=409, detail=f"Ya existe un tipo de habitación con el nombre '{room_type.nombre}'")
     db.refresh(nueva)
-    result = {**room_type.dict(), "id": nueva.id, "cantidad_habitaciones": 0}
+    result = {**room_type.model_dump(), "id": nueva.id, "cantidad_habitaciones": 0}
     if result.get('precio_base') is not None:
         result['precio_base'] = float(result['precio_base'])
     return result
 
 @router.put("/types/{type_id}", response_model=RoomTypeRead)
-async def update_room_type(
+def update_room_type(
     type_id: int,
     room_type: RoomTypeUpdate,
     db: Session = Depends(conexion.get_db),
@@ -194,7 +182,7 @@ async def update_room_type(
         raise HTTPException(status_code=404, detail="Tipo de habitación no encontrado o no pertenece a tu empresa")
     
     # Actualizar campos
-    update_data = room_type.dict(exclude_unset=True)
+    update_data = room_type.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(tipo, field, value)
 
@@ -220,7 +208,7 @@ async def update_room_type(
     }
 
 @router.delete("/types/{type_id}")
-async def delete_room_type(
+def delete_room_type(
     type_id: int,
     db: Session = Depends(conexion.get_db),
     current_user = Depends(require_admin_or_manager)
@@ -254,7 +242,7 @@ async def delete_room_type(
 
 # Rooms Endpoints
 @router.get("", response_model=List[RoomRead])
-async def list_rooms(
+def list_rooms(
     db: Session = Depends(conexion.get_db),
     activas_solo: bool = Query(True),
     room_type_id: Optional[int] = Query(None),
@@ -289,7 +277,7 @@ async def list_rooms(
 
 
 @router.put("/{room_id}", response_model=RoomRead)
-async def update_room(
+def update_room(
     room_id: int,
     room: RoomUpdate,
     db: Session = Depends(conexion.get_db),
@@ -307,7 +295,7 @@ async def update_room(
     if not db_room:
         raise HTTPException(status_code=404, detail="Habitación no encontrada o no pertenece a tu empresa")
 
-    update_data = room.dict(exclude_unset=True)
+    update_data = room.model_dump(exclude_unset=True)
 
     if "room_type_id" in update_data:
         room_type = db.query(RoomType).filter(
@@ -346,7 +334,7 @@ async def update_room(
 
 
 @router.delete("/{room_id}")
-async def delete_room(
+def delete_room(
     room_id: int,
     db: Session = Depends(conexion.get_db),
     current_user = Depends(require_admin_or_manager)
@@ -398,7 +386,7 @@ async def delete_room(
     return {"message": "Habitación desactivada exitosamente"}
 
 @router.post("", response_model=RoomRead, status_code=status.HTTP_201_CREATED)
-async def create_room(
+def create_room(
     room: RoomCreate,
     db: Session = Depends(conexion.get_db),
     current_user = Depends(require_admin_or_manager)
@@ -422,7 +410,7 @@ async def create_room(
     if not room_type:
         raise HTTPException(status_code=404, detail="Tipo de habitación no encontrado o no pertenece a tu empresa")
 
-    nueva = Room(**room.dict(), empresa_usuario_id=tenant_id)
+    nueva = Room(**room.model_dump(), empresa_usuario_id=tenant_id)
     db.add(nueva)
     try:
         db.commit()
@@ -432,7 +420,7 @@ async def create_room(
     db.refresh(nueva)
     db.refresh(nueva.tipo)
     return {
-        **room.dict(), "id": nueva.id, "created_at": nueva.created_at,
+        **room.model_dump(), "id": nueva.id, "created_at": nueva.created_at,
         "updated_at": nueva.updated_at, "tipo_nombre": nueva.tipo.nombre,
         "capacidad": nueva.tipo.capacidad
     }
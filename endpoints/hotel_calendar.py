@@ -10,15 +10,15 @@ from decimal import Decimal
 from typing import Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer
 from sqlalchemy import and_, or_, func
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from database.conexion import get_db
 from models.core import (
     Reservation, ReservationRoom, ReservationGuest,
     Stay, StayRoomOccupancy, StayCharge, StayPayment,
-    Room, RoomType, Cliente, ClienteCorporativo, AuditEvent, HousekeepingTask, HotelSettings
+    Room, RoomType, Cliente, ClienteCorporativo, HousekeepingTask, HotelSettings
 )
 from models.servicios import ProductoServicio
 from utils.logging_utils import log_event
@@ -27,6 +27,7 @@ from utils.invoice_engine import compute_invoice
 from utils.timezone import get_hotel_now, HOTEL_TZ, to_hotel_time
 from utils.overstay_engine import check_overstay_status, OVERSTAY_DETECTED
 from utils.housekeeping_engine import generate_checkout_tasks
+from utils.audit import registrar_auditoria
 
 
 router = APIRouter(prefix="/api/calendar", tags=["Hotel Calendar"])
@@ -72,8 +73,7 @@ class CalendarBlock(BaseModel):
     clipped_left: bool = False  # true si el bloque inicia antes del rango solicitado
     clipped_right: bool = False  # true si el bloque termina después del rango solicitado
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CalendarMeta(BaseModel):
@@ -100,7 +100,7 @@ class CreateReservationRequest(BaseModel):
     nombre_temporal: Optional[str] = None
     fecha_checkin: str  # YYYY-MM-DD
     fecha_checkout: str  # YYYY-MM-DD
-    room_ids: List[int] = Field(..., min_items=1)
+    room_ids: List[int] = Field(..., min_length=1)
     estado: str = "confirmada"
     origen: Optional[str] = None
     notas: Optional[str] = None
@@ -215,8 +215,7 @@ class ProductoServicioResponse(ProductoServicioBase):
     actualizado_en: datetime
     actualizado_por: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ChargeRequest(BaseModel):
@@ -637,17 +636,19 @@ def get_calendar(
             stay_estados.append("cerrada")
         
         # Query base de stays
-        # OPTIMIZADO: Eagerly load ALL relationships to prevent N+1 queries
+        # OPTIMIZADO: Eagerly load ALL relationships to prevent N+1 queries.
+        # Many-to-one por JOIN; colecciones por selectinload (un SELECT ... IN por colección):
+        # joinear varias colecciones a la vez multiplica las filas (rooms x guests x cargos x pagos).
         stays_query = (
             db.query(Stay)
             .options(
                 joinedload(Stay.reservation).joinedload(Reservation.cliente),
                 joinedload(Stay.reservation).joinedload(Reservation.empresa),
-                joinedload(Stay.reservation).joinedload(Reservation.rooms).joinedload(ReservationRoom.room).joinedload(Room.tipo),
-                joinedload(Stay.reservation).joinedload(Reservation.guests),  # Include guests for pax count
-                joinedload(Stay.occupancies).joinedload(StayRoomOccupancy.room).joinedload(Room.tipo),
-                joinedload(Stay.charges),
-                joinedload(Stay.payments)
+                joinedload(Stay.reservation).selectinload(Reservation.rooms).joinedload(ReservationRoom.room).joinedload(Room.tipo),
+                joinedload(Stay.reservation).undefer(Reservation.guest_count),  # pax sin cargar guests
+                selectinload(Stay.occupancies).joinedload(StayRoomOccupancy.room).joinedload(Room.tipo),
+                selectinload(Stay.charges),
+                selectinload(Stay.payments)
             )
             .filter(
                 Stay.empresa_usuario_id == tenant_id,
@@ -756,7 +757,7 @@ def get_calendar(
                 color_hint = "checkout_pending"
             
             # Calcular Pax
-            pax = len(res.guests) if (res and res.guests) else 1
+            pax = (res.guest_count if res else 0) or 1
 
             # Si hay occupancies, crear un bloque por cada habitación ocupada
             if stay.occupancies:
@@ -881,14 +882,14 @@ def get_calendar(
             reservation_estados.append("no_show")
         
         # Query base de reservations
-        # OPTIMIZADO: Eagerly load ALL relationships including Room.tipo
+        # OPTIMIZADO: Eagerly load ALL relationships including Room.tipo (colecciones por selectinload)
         reservations_query = (
             db.query(Reservation)
             .options(
-                joinedload(Reservation.rooms).joinedload(ReservationRoom.room).joinedload(Room.tipo),
+                selectinload(Reservation.rooms).joinedload(ReservationRoom.room).joinedload(Room.tipo),
                 joinedload(Reservation.cliente),
                 joinedload(Reservation.empresa),
-                joinedload(Reservation.guests)  # Include guests for pax count
+                undefer(Reservation.guest_count)  # pax sin cargar guests
             )
             .filter(
                 Reservation.empresa_usuario_id == tenant_id,
@@ -949,7 +950,7 @@ def get_calendar(
                 color_hint = "no_show"
             
             # Calcular Pax
-            pax = len(res.guests) if res.guests else 1
+            pax = res.guest_count or 1
 
             render_window = compute_render_window(
                 res.fecha_checkin,
@@ -1156,7 +1157,8 @@ def create_reservation(
         db.add(res_guest)
     
     # Auditoría
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="reservation",
         entity_id=reservation.id,
         action="CREATE",
@@ -1164,7 +1166,6 @@ def create_reservation(
         descripcion=f"Reserva creada para {fecha_checkin} - {fecha_checkout}",
         payload={"room_ids": req.room_ids}
     )
-    db.add(audit)
     
     db.commit()
     db.refresh(reservation)
@@ -1267,14 +1268,14 @@ def update_reservation(
     reservation.updated_at = utcnow()
     
     # Auditoría
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="reservation",
         entity_id=reservation.id,
         action="UPDATE",
         usuario="sistema",
         descripcion=f"Reserva actualizada: {', '.join(cambios)}"
     )
-    db.add(audit)
     
     db.commit()
     db.refresh(reservation)
@@ -1289,7 +1290,7 @@ def update_reservation(
 
 
 @router.patch("/reservations/{reservation_id}/cancel")
-async def cancel_reservation(
+def cancel_reservation(
     reservation_id: int = Path(..., gt=0),
     req: CancelReservationRequest = ...,
     db: Session = Depends(get_db),
@@ -1366,14 +1367,14 @@ async def cancel_reservation(
     
     # Auditoría
     username = current_user.username
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="reservation",
         entity_id=reservation.id,
         action="CANCEL",
         usuario=username,
         descripcion=f"Reserva cancelada: {req.reason}"
     )
-    db.add(audit)
     
     db.commit()
     db.refresh(reservation)
@@ -1496,14 +1497,14 @@ def move_block(
         
         reservation.updated_at = utcnow()
         
-        audit = AuditEvent(
+        registrar_auditoria(
+            db,
             entity_type="reservation",
             entity_id=reservation.id,
             action="MOVE",
             usuario="sistema",
             descripcion=f"Reserva movida a habitación {req.room_id}"
         )
-        db.add(audit)
         
         db.commit()
         
@@ -1622,14 +1623,14 @@ def move_block(
         if req.hasta:
             occupancy.hasta = parse_to_datetime(req.hasta)
         
-        audit = AuditEvent(
+        registrar_auditoria(
+            db,
             entity_type="stay",
             entity_id=stay.id,
             action="ROOM_MOVE",
             usuario="sistema",
             descripcion=f"Estadía movida a habitación {req.room_id}"
         )
-        db.add(audit)
         
         db.commit()
         
@@ -1838,7 +1839,8 @@ def checkin_from_reservation(
     reservation.estado = "ocupada"
     
     # Auditoría
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay.id,
         action="CHECKIN",
@@ -1850,7 +1852,6 @@ def checkin_from_reservation(
             "guests_count": len(processed_guests)
         }
     )
-    db.add(audit)
     
     db.commit()
     db.refresh(stay)
@@ -2099,7 +2100,8 @@ def checkout_stay(
     # =====================================================================
     # 11) AUDITORÍA
     # =====================================================================
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay.id,
         action="CHECKOUT",
@@ -2120,7 +2122,6 @@ def checkout_stay(
             "closed_rooms": closed_rooms,
         }
     )
-    db.add(audit)
     
     # =====================================================================
     # 12) COMMIT
@@ -2391,7 +2392,8 @@ def add_charge(
     db.add(charge)
     
     # Auditoría
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay_id,
         action="ADD_CHARGE",
@@ -2402,7 +2404,6 @@ def add_charge(
             "monto": req.monto_total
         }
     )
-    db.add(audit)
     
     db.commit()
     db.refresh(charge)
@@ -2445,7 +2446,8 @@ def delete_charge(
         raise HTTPException(404, "Cargo no encontrado")
     
     # Auditoría antes de borrar
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay_id,
         action="DELETE_CHARGE",
@@ -2457,7 +2459,6 @@ def delete_charge(
             "monto": float(charge.monto_total)
         }
     )
-    db.add(audit)
     
     db.delete(charge)
     db.commit()
@@ -2504,7 +2505,8 @@ def add_payment(
     db.add(payment)
     
     # Auditoría
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay_id,
         action="ADD_PAYMENT",
@@ -2516,7 +2518,6 @@ def add_payment(
             "referencia": req.referencia
         }
     )
-    db.add(audit)
     
     db.commit()
     db.refresh(payment)
@@ -3014,7 +3015,8 @@ def confirm_checkout(
     # Persistir descuentos/impuestos como items si es necesario (omitido por brevedad, asumimos engine simple)
 
     # 7. Generar Auditoría
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay_id,
         action="CHECKOUT_CONFIRMED" if not req.retroactive_time else "RETROACTIVE_CHECKOUT",
@@ -3025,10 +3027,9 @@ def confirm_checkout(
             "grand_total": float(final_grand_total),
             "surcharge": float(surcharge_amount),
             "balance": float(final_balance),
-            "overrides": req.dict(exclude_none=True)
+            "overrides": req.model_dump(exclude_none=True)
         }
     )
-    db.add(audit)
     
     # 8. Housekeeping + Estado de habitaciones
     # El módulo de limpieza del hotel manda: si está activo, la habitación queda en
@@ -3366,7 +3367,8 @@ def checkout_stay(
             hk_task_id = new_task.id
 
     # Auditoría
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay.id,
         action="CHECKOUT_CONFIRM",
@@ -3383,7 +3385,6 @@ def checkout_stay(
             }
         }
     )
-    db.add(audit)
 
     db.commit()
     db.refresh(stay)
@@ -3587,7 +3588,7 @@ def update_producto_servicio(
     if not producto:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Producto/servicio no encontrado o no pertenece a tu empresa")
 
-    data = payload.dict(exclude_unset=True)
+    data = payload.model_dump(exclude_unset=True)
     for key, value in data.items():
         setattr(producto, key, value)
     producto.actualizado_por = getattr(current_user, "username", None)
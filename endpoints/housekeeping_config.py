@@ -1,7 +1,7 @@
 """
 Configuración de housekeeping (Fase 3): plantillas/checklists y reglas de limpieza recurrente.
 """
-from typing import Optional, List
+from typing import Literal, Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
@@ -25,7 +25,7 @@ def _tenant(u: Usuario) -> int:
 # ============================ Plantillas ============================
 class TemplateIn(BaseModel):
     nombre: str = Field(..., min_length=1, max_length=100)
-    tipo: str = Field("eventual", pattern="^(checkout|stayover|eventual)$")
+    tipo: Literal["checkout", "stayover", "eventual"] = "eventual"
     checklist: List[str] = Field(default_factory=list)
     activo: bool = True
 
@@ -95,10 +95,10 @@ def delete_template(tpl_id: int, current_user: Usuario = Depends(require_admin_o
 class RuleIn(BaseModel):
     nombre: str = Field(..., min_length=1, max_length=120)
     cada_n_dias: int = Field(15, ge=1, le=365)
-    scope: str = Field("todas", pattern="^(todas|tipo)$")
+    scope: Literal["todas", "tipo"] = "todas"
     room_type_id: Optional[int] = None
     template_id: Optional[int] = None
-    prioridad: str = Field("media", pattern="^(baja|media|alta|urgente)$")
+    prioridad: Literal["baja", "media", "alta", "urgente"] = "media"
     activo: bool = True
 
 
@@ -3,7 +3,7 @@ Mantenimiento y Objetos Olvidados (Fase 2 de Housekeeping).
 Entidades reales (no dentro de task.meta), con aislamiento por tenant y conexión con
 el estado operativo de la habitación.
 """
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -24,18 +24,21 @@ ESTADOS_LOST = {"guardado", "entregado", "descartado"}
 
 
 # ============================ Schemas ============================
+_Prioridad = Literal["baja", "media", "alta", "urgente"]
+
+
 class TicketCreate(BaseModel):
     room_id: int = Field(..., gt=0)
     descripcion: str = Field(..., min_length=1)
     tipo: Optional[str] = Field(None, max_length=50)
-    prioridad: str = Field("media", pattern="^(baja|media|alta|urgente)$")
+    prioridad: _Prioridad = "media"
     bloquea_room: bool = False
     asignado_a: Optional[str] = Field(None, max_length=100)
 
 
 class TicketUpdate(BaseModel):
-    estado: Optional[str] = Field(None, pattern="^(abierto|en_progreso|resuelto|cancelado)$")
-    prioridad: Optional[str] = Field(None, pattern="^(baja|media|alta|urgente)$")
+    estado: Optional[Literal["abierto", "en_progreso", "resuelto", "cancelado"]] = None
+    prioridad: Optional[_Prioridad] = None
     asignado_a: Optional[str] = Field(None, max_length=100)
     descripcion: Optional[str] = None
     bloquea_room: Optional[bool] = None
@@ -48,7 +51,7 @@ class LostItemCreate(BaseModel):
 
 
 class LostItemUpdate(BaseModel):
-    estado: Optional[str] = Field(None, pattern="^(guardado|entregado|descartado)$")
+    estado: Optional[Literal["guardado", "entregado", "descartado"]] = None
     entregado_a: Optional[str] = Field(None, max_length=120)
     lugar: Optional[str] = Field(None, max_length=150)
 
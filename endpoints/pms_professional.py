@@ -5,26 +5,28 @@ Diseño Senior: Single Source of Truth, sin duplicidades, sin hacks
 
 from datetime import datetime, date, timedelta
 from utils.datetime_utils import utcnow
-from typing import List, Optional
+from typing import Annotated, List, Optional
 from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, status, Header
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.orm.attributes import flag_modified
-from sqlalchemy import and_, or_, func
-from pydantic import BaseModel, Field
+from sqlalchemy import and_, or_, func, insert
+from pydantic import BaseModel, BeforeValidator, Field
 
 from database.conexion import get_db
 from models.core import (
     Reservation, ReservationRoom, ReservationGuest, Room, RoomType,
     Stay, StayRoomOccupancy, StayCharge, StayPayment,
-    DailyRate, RatePlan, AuditEvent, Cliente, ClienteCorporativo,
-    HousekeepingTask, HotelSettings, HKRecurringRule, HKTemplate
+    DailyRate, RatePlan, Cliente, ClienteCorporativo,
+    HousekeepingTask, HotelSettings, HKRecurringRule
 )
 from models import Usuario
 from utils.logging_utils import log_event
 from utils.dependencies import get_current_user, require_staff, require_admin_or_manager
 from utils.invoice_engine import compute_invoice
+from utils.housekeeping_engine import get_template_checklist
+from utils.audit import registrar_auditoria
 
 
 router = APIRouter(prefix="/pms", tags=["PMS Professional"])
@@ -34,6 +36,17 @@ router = APIRouter(prefix="/pms", tags=["PMS Professional"])
 # 🧩 SCHEMAS
 # ========================================================================
 
+def _fecha_iso(v):
+    """Igual que parse_to_date: de "YYYY-MM-DDTHH:MM..." se toma solo la fecha.
+    Un string vacío equivale a no enviarla (move/resize mantienen la fecha actual)."""
+    if isinstance(v, str):
+        return v.split("T")[0] if v.strip() else None
+    return v
+
+# Fecha ISO parseada una vez al validar el request (la variante opcional acepta "")
+_FechaISO = Annotated[date, BeforeValidator(_fecha_iso)]
+_FechaISOOpcional = Annotated[Optional[date], BeforeValidator(_fecha_iso)]
+
 class BlockUI(BaseModel):
     """Bloque para renderizar en scheduler (Reserva o Estadía)"""
     id: str  # "res-55" o "stay-90-occ-12"
@@ -78,8 +91,8 @@ class MoveBlockRequest(BaseModel):
     stay_id: Optional[int] = None
     occupancy_id: Optional[int] = None  # requerido para move de stays
     room_id: int
-    fecha_checkin: Optional[str] = None  # Para reservation/resize
-    fecha_checkout: Optional[str] = None
+    fecha_checkin: _FechaISOOpcional = None  # Para reservation/resize
+    fecha_checkout: _FechaISOOpcional = None
     desde: Optional[str] = None  # Para stay (ISO datetime)
     hasta: Optional[str] = None
     motivo: str = "user_action"
@@ -88,9 +101,9 @@ class MoveBlockRequest(BaseModel):
 class CreateReservationRequest(BaseModel):
     """QuickBook: creación rápida"""
     nombre_temporal: str
-    fecha_checkin: str  # YYYY-MM-DD
-    fecha_checkout: str
-    room_ids: List[int] = Field(..., min_items=1)
+    fecha_checkin: _FechaISO  # YYYY-MM-DD
+    fecha_checkout: _FechaISO
+    room_ids: List[int] = Field(..., min_length=1)
     estado: str = "confirmada"
     cliente_id: Optional[int] = None
     empresa_id: Optional[int] = None
@@ -369,28 +382,30 @@ def _generate_recurring_tasks(db: Session, target_date: date, tenant_id: int):
         # Checklist desde plantilla (si tiene)
         checklist = []
         if rule.template_id:
-            tpl = db.query(HKTemplate).filter(
-                HKTemplate.id == rule.template_id, HKTemplate.empresa_usuario_id == tenant_id
-            ).first()
-            if tpl and tpl.checklist:
-                checklist = [
-                    {"nombre": (it.get("nombre") if isinstance(it, dict) else str(it)), "done": False}
-                    for it in tpl.checklist
-                ]
-
-        for room in rooms:
-            existing = db.query(HousekeepingTask).filter(
-                HousekeepingTask.room_id == room.id,
+            nombres = get_template_checklist(db, rule.template_id, tenant_id)
+            if nombres:
+                checklist = [{"nombre": n, "done": False} for n in nombres]
+
+        # Una sola consulta para las que ya tienen tarea eventual hoy, y un INSERT multi-fila
+        # para el resto (en vez de un SELECT + un INSERT por habitación).
+        room_ids = [room.id for room in rooms]
+        ya_generadas = {
+            rid for (rid,) in db.query(HousekeepingTask.room_id).filter(
+                HousekeepingTask.room_id.in_(room_ids),
                 HousekeepingTask.task_date == target_date,
                 HousekeepingTask.task_type == "eventual",
-            ).first()
-            if existing:
-                continue
-            db.add(HousekeepingTask(
-                empresa_usuario_id=tenant_id, room_id=room.id, task_date=target_date,
-                task_type="eventual", status="pending", priority=rule.prioridad,
-                meta={"source": "recurring", "rule": rule.nombre, "checklist": checklist},
-            ))
+            ).all()
+        } if room_ids else set()
+        rows = [
+            {
+                "empresa_usuario_id": tenant_id, "room_id": rid, "task_date": target_date,
+                "task_type": "eventual", "status": "pending", "priority": rule.prioridad,
+                "meta": {"source": "recurring", "rule": rule.nombre, "checklist": checklist},
+            }
+            for rid in room_ids if rid not in ya_generadas
+        ]
+        if rows:
+            db.execute(insert(HousekeepingTask), rows)
 
         rule.ultima_generacion = target_date
 
@@ -1287,8 +1302,8 @@ def move_block(
             raise HTTPException(409, f"Reserva en estado {res.estado} no puede moverse")
 
         # Parsear nuevas fechas
-        nueva_checkin = parse_to_date(req.fecha_checkin) if req.fecha_checkin else res.fecha_checkin
-        nueva_checkout = parse_to_date(req.fecha_checkout) if req.fecha_checkout else res.fecha_checkout
+        nueva_checkin = req.fecha_checkin or res.fecha_checkin
+        nueva_checkout = req.fecha_checkout or res.fecha_checkout
 
         if nueva_checkout <= nueva_checkin:
             raise HTTPException(400, "Fechas inválidas")
@@ -1310,7 +1325,8 @@ def move_block(
         if req.room_id and res.rooms and res.rooms[0].room_id != req.room_id:
             res.rooms[0].room_id = req.room_id
 
-        audit = AuditEvent(
+        registrar_auditoria(
+            db,
             entity_type="reservation",
             entity_id=res.id,
             action="MOVE",
@@ -1318,7 +1334,6 @@ def move_block(
             descripcion=f"Movida a {nueva_checkin} - {nueva_checkout}",
             payload={"room_id": req.room_id, "motivo": req.motivo}
         )
-        db.add(audit)
         db.commit()
 
         log_event("calendar", "usuario", "Mover reserva", f"id={req.reservation_id}")
@@ -1372,7 +1387,8 @@ def move_block(
         if req.hasta:
             occ.hasta = datetime.fromisoformat(req.hasta)
 
-        audit = AuditEvent(
+        registrar_auditoria(
+            db,
             entity_type="stay",
             entity_id=stay.id,
             action="MOVE",
@@ -1380,7 +1396,6 @@ def move_block(
             descripcion=f"Moved to room {req.room_id}",
             payload={"occupancy_id": req.occupancy_id}
         )
-        db.add(audit)
         db.commit()
 
         log_event("calendar", "usuario", "Mover stay", f"id={stay.id}")
@@ -1403,8 +1418,8 @@ def create_reservation(
     """
     Crear reserva (QuickBook)
     """
-    desde = parse_to_date(req.fecha_checkin)
-    hasta = parse_to_date(req.fecha_checkout)
+    desde = req.fecha_checkin
+    hasta = req.fecha_checkout
 
     if hasta <= desde:
         raise HTTPException(400, "Fechas inválidas")
@@ -1440,14 +1455,14 @@ def create_reservation(
         )
         db.add(res_room)
 
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="reservation",
         entity_id=res.id,
         action="CREATE",
         usuario="sistema",
         descripcion=f"Reserva creada {desde} - {hasta}"
     )
-    db.add(audit)
 
     db.commit()
     db.refresh(res)
@@ -1596,14 +1611,14 @@ def checkin_from_reservation(
         )
         db.add(pago)
 
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay.id,
         action="CHECKIN",
         usuario="sistema",
         descripcion=f"Check-in desde reserva {id}"
     )
-    db.add(audit)
 
     db.commit()
     db.refresh(stay)
@@ -1678,7 +1693,8 @@ def add_charge(
     )
     db.add(charge)
 
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=id,
         action="ADD_CHARGE",
@@ -1686,7 +1702,6 @@ def add_charge(
         descripcion=f"Cargo: {req.descripcion}",
         payload={"monto": float(monto_total)}
     )
-    db.add(audit)
 
     db.commit()
     db.refresh(charge)
@@ -1752,7 +1767,8 @@ def add_payment(
     )
     db.add(payment)
 
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=id,
         action="PAYMENT",
@@ -1760,7 +1776,6 @@ def add_payment(
         descripcion=f"Pago {req.metodo} {req.monto}",
         payload={"ref": req.ref}
     )
-    db.add(audit)
 
     db.commit()
 
@@ -2008,7 +2023,8 @@ def checkout_stay(
     # =====================================================================
     # 10) AUDITORÍA
     # =====================================================================
-    audit = AuditEvent(
+    registrar_auditoria(
+        db,
         entity_type="stay",
         entity_id=stay.id,
         action="CHECKOUT",
@@ -2024,7 +2040,6 @@ def checkout_stay(
             "closed_rooms": closed_rooms,
         }
     )
-    db.add(audit)
 
     # =====================================================================
     # 11) COMMIT
@@ -8,8 +8,8 @@ from typing import List, Optional
 from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, status, UploadFile, File
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
-from pydantic import BaseModel, Field, field_validator
+from sqlalchemy import and_, or_, func, insert
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from database.conexion import get_db
 from models.core import RatePlan, DailyRate, RoomType, Reservation, Stay
@@ -43,8 +43,7 @@ class RatePlanSchema(BaseModel):
     reglas: Optional[dict] = None
     activo: bool = True
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DailyRateSchema(BaseModel):
@@ -54,7 +53,7 @@ class DailyRateSchema(BaseModel):
     fecha: str  # YYYY-MM-DD
     precio: Decimal
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
     @field_validator("fecha", mode="before")
     @classmethod
@@ -515,6 +514,14 @@ async def bulk_upload_rates(
     updated = 0
     error_detail = []
 
+    # Tipos de habitación del tenant: una sola consulta en vez de una por fila
+    tipos_validos = {
+        rt_id for (rt_id,) in db.query(RoomType.id).filter(RoomType.empresa_usuario_id == tenant_id).all()
+    }
+
+    # (room_type_id, fecha, rate_plan_id) -> precio; si una clave se repite en el CSV gana la última
+    tarifas = {}
+
     for row_num, row in enumerate(reader, start=2):  # start=2 porque row 1 es header
         # Normalizar claves
         row = {k.strip().lower(): v.strip() for k, v in row.items()}
@@ -536,39 +543,51 @@ async def bulk_upload_rates(
                 raise ValueError(f"Fecha inválida '{fecha_str}' — usar formato YYYY-MM-DD")
 
             # Validar room_type pertenece al tenant
-            rt = db.query(RoomType).filter(
-                RoomType.id == room_type_id,
-                RoomType.empresa_usuario_id == tenant_id,
-            ).first()
-            if not rt:
+            if room_type_id not in tipos_validos:
                 raise ValueError(f"room_type_id={room_type_id} no existe en este tenant")
 
-            # Upsert (acotado al tenant)
-            existing = db.query(DailyRate).filter(
-                DailyRate.empresa_usuario_id == tenant_id,
-                DailyRate.room_type_id == room_type_id,
-                DailyRate.fecha == fecha_dt,
-                DailyRate.rate_plan_id == rate_plan_id,
-            ).first()
-
-            if existing:
-                existing.precio = precio
+            clave = (room_type_id, fecha_dt, rate_plan_id)
+            if clave in tarifas:
                 updated += 1
-            else:
-                new_rate = DailyRate(
-                    room_type_id=room_type_id,
-                    rate_plan_id=rate_plan_id,
-                    fecha=fecha_dt,
-                    precio=precio,
-                    empresa_usuario_id=tenant_id,
-                )
-                db.add(new_rate)
-                inserted += 1
+            tarifas[clave] = precio
 
         except Exception as exc:
             error_detail.append({"row": row_num, "error": str(exc), "data": dict(row)})
             continue
 
+    if tarifas:
+        # Upsert (acotado al tenant): las existentes se traen en una sola consulta por rango
+        fechas = [fecha for (_, fecha, _) in tarifas]
+        existentes = {
+            (r.room_type_id, r.fecha.replace(tzinfo=None), r.rate_plan_id): r
+            for r in db.query(DailyRate).filter(
+                DailyRate.empresa_usuario_id == tenant_id,
+                DailyRate.room_type_id.in_({rt_id for (rt_id, _, _) in tarifas}),
+                DailyRate.fecha >= min(fechas),
+                DailyRate.fecha <= max(fechas),
+            ).all()
+        }
+
+        nuevas = []
+        for (room_type_id, fecha_dt, rate_plan_id), precio in tarifas.items():
+            existing = existentes.get((room_type_id, fecha_dt, rate_plan_id))
+            if existing:
+                existing.precio = precio
+                updated += 1
+            else:
+                nuevas.append({
+                    "room_type_id": room_type_id,
+                    "rate_plan_id": rate_plan_id,
+                    "fecha": fecha_dt,
+                    "precio": precio,
+                    "empresa_usuario_id": tenant_id,
+                })
+
+        # Un INSERT multi-fila para todas las tarifas nuevas
+        if nuevas:
+            db.execute(insert(DailyRate), nuevas)
+            inserted = len(nuevas)
+
     db.commit()
 
     log_event("pricing", current_user.username, "Bulk upload tarifas",
@@ -1,12 +1,12 @@
 """
 Endpoints para gestión de Configuraciones del Hotel (HotelSettings)
 """
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from database.conexion import get_db
 from models.core import HotelSettings, EmpresaUsuario
@@ -27,8 +27,7 @@ class HotelSettingsCreate(BaseModel):
     timezone: str = "America/Argentina/Buenos_Aires"
     overstay_price: Optional[float] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class HotelSettingsUpdate(BaseModel):
@@ -61,11 +60,10 @@ class HotelSettingsUpdate(BaseModel):
     housekeeping_enabled: Optional[bool] = None
 
     # Política de limpieza (stayover)
-    stayover_policy: Optional[str] = Field(None, pattern="^(diaria|solo_checkout|cada_n_dias)$")
+    stayover_policy: Optional[Literal["diaria", "solo_checkout", "cada_n_dias"]] = None
     stayover_cada_n_dias: Optional[int] = Field(None, ge=1, le=60)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class HotelSettingsRead(BaseModel):
@@ -105,8 +103,7 @@ class HotelSettingsRead(BaseModel):
     created_at: str
     updated_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
     
     @field_validator('created_at', 'updated_at', mode='before')
     @classmethod
@@ -174,9 +171,9 @@ def get_hotel_settings(
                 f"empresa_usuario_id={empresa_usuario_id} action=default_settings_created"
             )
             
-            return HotelSettingsRead.from_orm(new_settings)
+            return HotelSettingsRead.model_validate(new_settings)
 
-        return HotelSettingsRead.from_orm(settings)
+        return HotelSettingsRead.model_validate(settings)
 
     except HTTPException:
         raise
@@ -250,7 +247,7 @@ def update_hotel_settings(
                 f"empresa_usuario_id={empresa_usuario_id} action=settings_created"
             )
             
-            return HotelSettingsRead.from_orm(new_settings)
+            return HotelSettingsRead.model_validate(new_settings)
 
         # Actualizar campos proporcionados
         if settings_data.checkout_hour is not None:
@@ -331,7 +328,7 @@ def update_hotel_settings(
             f"empresa_usuario_id={empresa_usuario_id} checkout_hour={settings.checkout_hour} auto_extend_stays={settings.auto_extend_stays}"
         )
 
-        return HotelSettingsRead.from_orm(settings)
+        return HotelSettingsRead.model_validate(settings)
 
     except HTTPException:
         raise
@@ -403,7 +400,7 @@ def create_hotel_settings(
             )
 
         # Crear nuevas configuraciones
-        new_settings = HotelSettings(**settings_data.dict())
+        new_settings = HotelSettings(**settings_data.model_dump())
         db.add(new_settings)
         db.commit()
         db.refresh(new_settings)
@@ -415,7 +412,7 @@ def create_hotel_settings(
             f"empresa_usuario_id={settings_data.empresa_usuario_id}"
         )
 
-        return HotelSettingsRead.from_orm(new_settings)
+        return HotelSettingsRead.model_validate(new_settings)
 
     except HTTPException:
         raise
@@ -1,6 +1,6 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import os
 import logging
 
@@ -35,6 +35,9 @@ app = FastAPI(
     title="Hotel Management API",
     version="1.0.0",
     description="Sistema de gestión hotelera multi-tenant",
+    # Respuestas ya convertidas a tipos JSON (response_model / jsonable_encoder):
+    # orjson solo reemplaza el json.dumps final, más rápido en listados grandes
+    default_response_class=ORJSONResponse,
 )
 
 # ========== RATE LIMITING ==========
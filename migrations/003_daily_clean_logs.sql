@@ -1,7 +1,8 @@
 -- 003_daily_clean_logs.sql
 -- Crear tabla para registrar limpiezas diarias sin persistir tareas
+-- Idempotente: se puede re-ejecutar sin errores.
 
-CREATE TABLE daily_clean_logs (
+CREATE TABLE IF NOT EXISTS daily_clean_logs (
     id SERIAL PRIMARY KEY,
     room_id INTEGER NOT NULL REFERENCES rooms(id) ON DELETE RESTRICT,
     date DATE NOT NULL,
@@ -11,5 +12,5 @@ CREATE TABLE daily_clean_logs (
     CONSTRAINT uq_daily_clean_room_date UNIQUE(room_id, date)
 );
 
-CREATE INDEX idx_daily_clean_room ON daily_clean_logs(room_id);
-CREATE INDEX idx_daily_clean_date ON daily_clean_logs(date);
+-- room_id ya está cubierto por uq_daily_clean_room_date (ver 031)
+CREATE INDEX IF NOT EXISTS idx_daily_clean_date ON daily_clean_logs(date);
@@ -0,0 +1,10 @@
+-- ============================================================================
+-- 028 — Contadores chicos de habitaciones a SMALLINT
+-- Ejecutar: python scripts/run_migration.py migrations/028_smallint_room_counters.sql
+--
+-- room_types.capacidad (1..100) y rooms.piso (0..200) nunca salen del rango de
+-- SMALLINT (la API ya lo valida). Pasan de 4 a 2 bytes por fila.
+-- ============================================================================
+
+ALTER TABLE room_types ALTER COLUMN capacidad TYPE SMALLINT;
+ALTER TABLE rooms ALTER COLUMN piso TYPE SMALLINT;
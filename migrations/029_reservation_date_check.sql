@@ -0,0 +1,25 @@
+-- ============================================================================
+-- 029 — CHECK de orden de fechas en reservations
+-- Ejecutar: python scripts/run_migration.py migrations/029_reservation_date_check.sql
+--
+-- La API ya rechaza checkout <= checkin; esto lo garantiza también en la DB.
+-- Se agrega NOT VALID para no bloquear la migración si quedó alguna fila vieja
+-- inválida: las filas nuevas/actualizadas se validan igual. Ver la consulta de
+-- abajo para revisar las existentes y luego correr el VALIDATE.
+-- ============================================================================
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'ck_res_fechas_orden'
+    ) THEN
+        ALTER TABLE reservations
+            ADD CONSTRAINT ck_res_fechas_orden
+            CHECK (fecha_checkout > fecha_checkin) NOT VALID;
+    END IF;
+END $$;
+
+-- Filas existentes que violan la regla (deberían ser 0 antes de validar):
+--   SELECT id, fecha_checkin, fecha_checkout FROM reservations
+--   WHERE fecha_checkout <= fecha_checkin;
+-- ALTER TABLE reservations VALIDATE CONSTRAINT ck_res_fechas_orden;
@@ -0,0 +1,18 @@
+-- ============================================================================
+-- 030 — hk_incidents.fotos_url: JSON -> JSONB
+-- Ejecutar: python scripts/run_migration.py migrations/030_hk_incidents_fotos_jsonb.sql
+--
+-- JSONB se guarda ya parseado (no se re-parsea el texto en cada lectura) y admite
+-- operadores/índices (ej: jsonb_array_length(fotos_url) > 0 para "con fotos").
+-- La tabla la crea create_all al arrancar; si todavía no existe no hay nada que hacer.
+-- ============================================================================
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'hk_incidents' AND column_name = 'fotos_url' AND data_type = 'json'
+    ) THEN
+        ALTER TABLE hk_incidents ALTER COLUMN fotos_url TYPE JSONB USING fotos_url::jsonb;
+    END IF;
+END $$;
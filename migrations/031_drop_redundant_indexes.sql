@@ -0,0 +1,70 @@
+-- ============================================================================
+-- 031 — Eliminar índices redundantes
+-- Ejecutar: python scripts/run_migration.py migrations/031_drop_redundant_indexes.sql
+--
+-- Índices que duplican a otro existente: el de la PK (ix_<tabla>_id creados por
+-- index=True), los que repiten una UNIQUE y los de una columna que ya es prefijo de
+-- una UNIQUE compuesta (ej: empresa_usuario_id en uq_roomtype_empresa_nombre).
+-- Cada índice extra se actualiza en cada INSERT/UPDATE sin que el planner lo use.
+--
+-- Seguro de re-ejecutar: cada índice se borra SOLO si existe, no respalda una
+-- constraint y hay otro índice válido (no parcial) de la misma tabla cuyas
+-- primeras columnas son exactamente las suyas.
+-- ============================================================================
+
+DO $$
+DECLARE
+    v_nombre TEXT;
+    v_idx    OID;
+    v_tbl    OID;
+    v_keys   INT2[];
+    v_n      INT;
+BEGIN
+    FOREACH v_nombre IN ARRAY ARRAY[
+        -- PK ya indexada
+        'ix_roles_id', 'ix_permisos_id', 'ix_usuarios_id', 'ix_productos_servicios_id',
+        -- Duplican una UNIQUE de la misma columna
+        'idx_usuario_username', 'idx_usuario_email', 'idx_plan_nombre',
+        'idx_subscription_empresa_usuario', 'idx_hotel_settings_empresa', 'idx_hotel_settings_empresa_id',
+        -- Prefijo de una UNIQUE compuesta
+        'ix_roles_nombre', 'idx_cliente_corporativo_empresa_usuario', 'idx_cliente_empresa',
+        'idx_roomtype_empresa', 'idx_room_empresa', 'idx_rateplan_empresa', 'idx_rate_empresa',
+        'idx_resguest_res', 'idx_hkt_empresa', 'idx_hk_task_room_date', 'idx_daily_clean_room',
+        'idx_category_empresa'
+    ] LOOP
+        v_idx := to_regclass(v_nombre);
+        CONTINUE WHEN v_idx IS NULL;
+        CONTINUE WHEN EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = v_idx);
+
+        SELECT indrelid, indkey::INT2[] INTO v_tbl, v_keys FROM pg_index WHERE indexrelid = v_idx;
+        v_n := array_length(v_keys, 1);
+
+        IF EXISTS (
+            SELECT 1 FROM pg_index o
+            WHERE o.indrelid = v_tbl
+              AND o.indexrelid <> v_idx
+              AND o.indisvalid
+              AND o.indpred IS NULL
+              AND o.indexprs IS NULL
+              AND (o.indkey::INT2[])[0:v_n - 1] = v_keys[0:v_n - 1]
+        ) THEN
+            EXECUTE format('DROP INDEX %s', v_idx::regclass);
+            RAISE NOTICE 'Índice redundante eliminado: %', v_nombre;
+        END IF;
+    END LOOP;
+END $$;
+
+-- UNIQUE duplicadas: la columna tenía unique=True además de la constraint con nombre.
+-- Se conserva la constraint con nombre (uq_*) y se borra la autogenerada (*_key).
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_plan_nombre') THEN
+        ALTER TABLE planes DROP CONSTRAINT IF EXISTS planes_nombre_key;
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_subscription_empresa_usuario') THEN
+        ALTER TABLE subscriptions DROP CONSTRAINT IF EXISTS subscriptions_empresa_usuario_id_key;
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_hotel_settings_empresa_usuario') THEN
+        ALTER TABLE hotel_settings DROP CONSTRAINT IF EXISTS hotel_settings_empresa_usuario_id_key;
+    END IF;
+END $$;
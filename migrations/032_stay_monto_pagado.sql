@@ -0,0 +1,22 @@
+-- ============================================================================
+-- 032 — stays.monto_pagado (total pagado desnormalizado)
+-- Ejecutar: python scripts/run_migration.py migrations/032_stay_monto_pagado.sql
+--
+-- El ORM lo mantiene al agregar/borrar stay_payments (listener en models/core.py),
+-- así los saldos leen una columna en vez de SUM(stay_payments) por estadía.
+-- Los reversos (es_reverso = true) no suman, igual que en los endpoints.
+-- ============================================================================
+
+ALTER TABLE stays ADD COLUMN IF NOT EXISTS monto_pagado NUMERIC(12, 2) NOT NULL DEFAULT 0;
+
+-- Backfill desde los pagos existentes
+UPDATE stays s
+SET monto_pagado = p.total
+FROM (
+    SELECT stay_id, SUM(monto) AS total
+    FROM stay_payments
+    WHERE es_reverso = false
+    GROUP BY stay_id
+) p
+WHERE p.stay_id = s.id
+  AND s.monto_pagado IS DISTINCT FROM p.total;
@@ -0,0 +1,14 @@
+-- ============================================================================
+-- 033 — Índice compuesto del calendario en reservations
+-- Ejecutar: python scripts/run_migration.py migrations/033_reservations_calendar_index.sql
+--
+-- El calendario y la disponibilidad filtran por tenant + estado + solapamiento de
+-- fechas. 010 ya creaba este índice; ahora también está declarado en el modelo
+-- (create_all lo crea en bases nuevas). idx_res_empresa queda cubierto por el
+-- prefijo (empresa_usuario_id) y se elimina.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_reservations_empresa_estado_rango
+ON reservations(empresa_usuario_id, estado, fecha_checkin, fecha_checkout);
+
+DROP INDEX IF EXISTS idx_res_empresa;
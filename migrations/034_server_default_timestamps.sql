@@ -0,0 +1,73 @@
+-- ============================================================================
+-- 034 — Timestamps de alta con DEFAULT del servidor
+-- Ejecutar: python scripts/run_migration.py migrations/034_server_default_timestamps.sql
+--
+-- created_at/updated_at (y equivalentes) pasan de default Python (utcnow) a DEFAULT
+-- now() en la base: el INSERT ya no envía ese parámetro por fila y el ORM lo lee de
+-- vuelta con RETURNING. Las columnas timestamptz usan now(); las que siguen siendo
+-- timestamp sin zona usan timezone('utc', now()) para conservar UTC naive.
+-- ============================================================================
+
+DO $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT c.table_name, c.column_name, c.data_type
+        FROM information_schema.columns c
+        JOIN (VALUES
+            ('audit_events', 'timestamp'),
+            ('empresa_usuarios', 'created_at'),
+            ('empresa_usuarios', 'updated_at'),
+            ('permisos', 'creado_en'),
+            ('permisos', 'actualizado_en'),
+            ('planes', 'created_at'),
+            ('cliente_corporativo', 'created_at'),
+            ('cliente_corporativo', 'updated_at'),
+            ('hk_templates', 'created_at'),
+            ('hotel_settings', 'created_at'),
+            ('hotel_settings', 'updated_at'),
+            ('productos_servicios', 'creado_en'),
+            ('productos_servicios', 'actualizado_en'),
+            ('rate_plans', 'created_at'),
+            ('roles', 'creado_en'),
+            ('roles', 'actualizado_en'),
+            ('subscriptions', 'created_at'),
+            ('subscriptions', 'updated_at'),
+            ('transaction_categories', 'created_at'),
+            ('clientes', 'created_at'),
+            ('clientes', 'updated_at'),
+            ('hk_recurring_rules', 'created_at'),
+            ('payment_attempts', 'created_at'),
+            ('payment_attempts', 'updated_at'),
+            ('rooms', 'created_at'),
+            ('rooms', 'updated_at'),
+            ('usuarios', 'fecha_creacion'),
+            ('usuarios', 'fecha_ultima_modificacion'),
+            ('cash_closings', 'created_at'),
+            ('maintenance_tickets', 'created_at'),
+            ('reservations', 'created_at'),
+            ('reservations', 'updated_at'),
+            ('reservation_guests', 'created_at'),
+            ('stays', 'created_at'),
+            ('stays', 'updated_at'),
+            ('hk_cycles', 'created_at'),
+            ('hk_cycles', 'updated_at'),
+            ('housekeeping_tasks', 'created_at'),
+            ('housekeeping_tasks', 'updated_at'),
+            ('stay_charges', 'created_at'),
+            ('stay_payments', 'timestamp'),
+            ('stay_room_occupancies', 'created_at'),
+            ('transactions', 'created_at'),
+            ('hk_incidents', 'created_at')
+        ) AS v(table_name, column_name)
+          ON v.table_name = c.table_name AND v.column_name = c.column_name
+        WHERE c.table_schema = current_schema()
+    LOOP
+        IF r.data_type = 'timestamp with time zone' THEN
+            EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT now()', r.table_name, r.column_name);
+        ELSE
+            EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT timezone(''utc'', now())', r.table_name, r.column_name);
+        END IF;
+    END LOOP;
+END $$;
@@ -0,0 +1,13 @@
+-- ============================================================================
+-- 035 — stay_payments.timestamp: índice BRIN en vez de B-tree
+-- Ejecutar: python scripts/run_migration.py migrations/035_stay_payments_brin.sql
+--
+-- Los pagos solo se agregan, así que el orden físico de la tabla sigue a timestamp.
+-- Para los filtros por día/mes de estadísticas un BRIN ocupa una fracción del
+-- B-tree. Los accesos por estadía siguen usando idx_payment_stay.
+-- ============================================================================
+
+DROP INDEX IF EXISTS idx_payment_fecha;
+
+CREATE INDEX IF NOT EXISTS idx_payment_fecha
+ON stay_payments USING brin (timestamp);
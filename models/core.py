@@ -1,8 +1,10 @@
 from datetime import datetime, date
+from decimal import Decimal
 from utils.datetime_utils import utcnow
 from sqlalchemy import (
     Column,
     Integer,
+    SmallInteger,
     String,
     Date,
     DateTime,
@@ -16,8 +18,11 @@ from sqlalchemy import (
     CheckConstraint,
     text,
     Enum,
+    func,
+    select,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy import event
+from sqlalchemy.orm import Session, column_property, relationship
 from database.conexion import Base
 from sqlalchemy.dialects.postgresql import JSONB
 import enum
@@ -63,18 +68,17 @@ class Plan(Base):
     __tablename__ = "planes"
     __table_args__ = (
         UniqueConstraint("nombre", name="uq_plan_nombre"),
-        Index("idx_plan_nombre", "nombre"),
     )
 
     id = Column(Integer, primary_key=True)
-    nombre = Column(Enum(PlanType, values_callable=lambda obj: [e.value for e in obj]), nullable=False, unique=True)
+    nombre = Column(Enum(PlanType, values_callable=lambda obj: [e.value for e in obj]), nullable=False)
     descripcion = Column(Text, nullable=True)
     precio_mensual = Column(Numeric(12, 2), nullable=False)
     max_habitaciones = Column(Integer, nullable=False, default=10)
     max_usuarios = Column(Integer, nullable=False, default=5)
     caracteristicas = Column(JSONB, nullable=True)  # {"feature1": true, "feature2": false}
     activo = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     subscriptions = relationship("Subscription", back_populates="plan")
 
@@ -113,8 +117,8 @@ class EmpresaUsuario(Base):
     activa = Column(Boolean, default=True, nullable=False)
     deleted = Column(Boolean, default=False, nullable=False)
     
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     # Relationships
     usuarios = relationship("Usuario", back_populates="empresa_usuario")
@@ -142,7 +146,7 @@ class Subscription(Base):
     )
 
     id = Column(Integer, primary_key=True)
-    empresa_usuario_id = Column(Integer, ForeignKey("empresa_usuarios.id"), nullable=False, unique=True)
+    empresa_usuario_id = Column(Integer, ForeignKey("empresa_usuarios.id"), nullable=False)
     plan_id = Column(Integer, ForeignKey("planes.id"), nullable=False)
     
     estado = Column(Enum(SubscriptionStatus, values_callable=lambda obj: [e.value for e in obj]), default=SubscriptionStatus.ACTIVO, nullable=False)
@@ -150,8 +154,8 @@ class Subscription(Base):
     
     metadata_json = Column(JSONB, nullable=True)  # {last_payment_id, billing_email, etc}
     
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     # Relationships
     empresa_usuario = relationship("EmpresaUsuario", back_populates="subscription")
@@ -179,8 +183,8 @@ class PaymentAttempt(Base):
     webhook_url = Column(String(500), nullable=True)
     response_json = Column(JSONB, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     # Relationships
     subscription = relationship("Subscription", back_populates="payment_attempts")
@@ -196,7 +200,6 @@ class ClienteCorporativo(Base):
     __table_args__ = (
         UniqueConstraint("empresa_usuario_id", "cuit", name="uq_cliente_corporativo_cuit_empresa"),
         Index("idx_cliente_corporativo_nombre", "nombre"),
-        Index("idx_cliente_corporativo_empresa_usuario", "empresa_usuario_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -215,8 +218,8 @@ class ClienteCorporativo(Base):
     provincia = Column(String(100), nullable=True)
 
     activo = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     # Relationships
     empresa_usuario = relationship("EmpresaUsuario", back_populates="clientes_corporativos")
@@ -229,7 +232,6 @@ class Cliente(Base):
         UniqueConstraint("empresa_usuario_id", "tipo_documento", "numero_documento", name="uq_doc_empresa"),
         Index("idx_cliente_email", "email"),
         Index("idx_cliente_telefono", "telefono"),
-        Index("idx_cliente_empresa", "empresa_usuario_id"),
         Index("idx_cliente_corporativo", "empresa_id"),
     )
 
@@ -253,8 +255,8 @@ class Cliente(Base):
     motivo_blacklist = Column(Text, nullable=True)
 
     activo = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     # Relationships
     empresa_usuario = relationship("EmpresaUsuario", back_populates="clientes")
@@ -265,14 +267,13 @@ class RoomType(Base):
     __tablename__ = "room_types"
     __table_args__ = (
         UniqueConstraint("empresa_usuario_id", "nombre", name="uq_roomtype_empresa_nombre"),
-        Index("idx_roomtype_empresa", "empresa_usuario_id"),
     )
 
     id = Column(Integer, primary_key=True)
     empresa_usuario_id = Column(Integer, ForeignKey("empresa_usuarios.id", ondelete="CASCADE"), nullable=False)
     nombre = Column(String(60), nullable=False)
     descripcion = Column(Text, nullable=True)
-    capacidad = Column(Integer, nullable=False, default=1)
+    capacidad = Column(SmallInteger, nullable=False, default=1)
     precio_base = Column(Numeric(12, 2), nullable=True)  # Tarifa nocturna base
     amenidades = Column(JSONB, nullable=True)  # ["wifi","tv",...]
     activo = Column(Boolean, default=True, nullable=False)
@@ -284,13 +285,12 @@ class Room(Base):
         UniqueConstraint("empresa_usuario_id", "numero", name="uq_room_empresa_numero"),
         Index("idx_room_tipo", "room_type_id"),
         Index("idx_room_estado_operativo", "estado_operativo"),
-        Index("idx_room_empresa", "empresa_usuario_id"),
     )
 
     id = Column(Integer, primary_key=True)
     empresa_usuario_id = Column(Integer, ForeignKey("empresa_usuarios.id", ondelete="CASCADE"), nullable=False)
     numero = Column(String(10), nullable=False)   # "101", "PB1" si algún día te pintan letras
-    piso = Column(Integer, nullable=True)
+    piso = Column(SmallInteger, nullable=True)
     room_type_id = Column(Integer, ForeignKey("room_types.id"), nullable=False)
 
     # Estado OPERATIVO (venta)
@@ -301,8 +301,8 @@ class Room(Base):
     particularidades = Column(JSONB, nullable=True)  # {"jacuzzi":true,...}
     activo = Column(Boolean, default=True, nullable=False)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     tipo = relationship("RoomType")
     empresa_usuario = relationship("EmpresaUsuario", back_populates="habitaciones")
@@ -313,7 +313,6 @@ class RatePlan(Base):
     __table_args__ = (
         UniqueConstraint("empresa_usuario_id", "nombre", name="uq_rateplan_empresa_nombre"),
         Index("idx_rateplan_activo", "activo"),
-        Index("idx_rateplan_empresa", "empresa_usuario_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -325,7 +324,7 @@ class RatePlan(Base):
     reglas = Column(JSONB, nullable=True)
 
     activo = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     empresa_usuario = relationship("EmpresaUsuario")
 
@@ -339,7 +338,6 @@ class DailyRate(Base):
     __table_args__ = (
         UniqueConstraint("empresa_usuario_id", "room_type_id", "fecha", "rate_plan_id", name="uq_rate_day_empresa"),
         Index("idx_rate_fecha", "fecha"),
-        Index("idx_rate_empresa", "empresa_usuario_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -359,7 +357,13 @@ class Reservation(Base):
     __table_args__ = (
         Index("idx_res_fechas", "fecha_checkin", "fecha_checkout"),
         Index("idx_res_estado", "estado"),
-        Index("idx_res_empresa", "empresa_usuario_id"),
+        # Calendario/disponibilidad: tenant + estado + rango de fechas.
+        # También cubre los filtros solo por tenant (prefijo).
+        Index(
+            "idx_reservations_empresa_estado_rango",
+            "empresa_usuario_id", "estado", "fecha_checkin", "fecha_checkout",
+        ),
+        CheckConstraint("fecha_checkout > fecha_checkin", name="ck_res_fechas_orden"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -388,14 +392,16 @@ class Reservation(Base):
     # Snapshot opcional: datos para reconstruir rápido sin 50 joins
     meta = Column(JSONB, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     cliente = relationship("Cliente")
     empresa = relationship("ClienteCorporativo", foreign_keys=[empresa_id])
     empresa_usuario = relationship("EmpresaUsuario", back_populates="reservas")
-    rooms = relationship("ReservationRoom", back_populates="reservation", cascade="all, delete-orphan")
-    guests = relationship("ReservationGuest", back_populates="reservation", cascade="all, delete-orphan")
+    # Las FK hijas ya tienen ON DELETE CASCADE: passive_deletes evita cargar las filas
+    # hijas para borrarlas una por una y deja el borrado en cascada a la DB.
+    rooms = relationship("ReservationRoom", back_populates="reservation", cascade="all, delete-orphan", passive_deletes=True)
+    guests = relationship("ReservationGuest", back_populates="reservation", cascade="all, delete-orphan", passive_deletes=True)
 
     def can_checkin(self):
         """Verifica si la reserva puede hacer check-in"""
@@ -442,7 +448,6 @@ class ReservationGuest(Base):
     __tablename__ = "reservation_guests"
     __table_args__ = (
         UniqueConstraint("reservation_id", "cliente_id", name="uq_res_guest"),
-        Index("idx_resguest_res", "reservation_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -452,11 +457,22 @@ class ReservationGuest(Base):
     # principal | adulto | menor
     rol = Column(String(20), nullable=False)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     reservation = relationship("Reservation", back_populates="guests")
     cliente = relationship("Cliente")
 
+
+# Cantidad de huéspedes como subconsulta correlacionada. Diferida: solo se calcula con
+# undefer(Reservation.guest_count), para contar (pax) sin cargar la colección guests.
+Reservation.guest_count = column_property(
+    select(func.count(ReservationGuest.id))
+    .where(ReservationGuest.reservation_id == Reservation.id)
+    .correlate_except(ReservationGuest)
+    .scalar_subquery(),
+    deferred=True,
+)
+
 class Stay(Base):
     __tablename__ = "stays"
     __table_args__ = (
@@ -478,14 +494,18 @@ class Stay(Base):
 
     notas_internas = Column(Text, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    # Total pagado sin reversos (desnormalizado). Lo mantiene _sync_stay_monto_pagado
+    # al agregar/borrar StayPayment, así los saldos no re-suman stay_payments.
+    monto_pagado = Column(Numeric(12, 2), nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     reservation = relationship("Reservation")
     empresa_usuario = relationship("EmpresaUsuario", back_populates="stays")
-    occupancies = relationship("StayRoomOccupancy", back_populates="stay", cascade="all, delete-orphan")
-    charges = relationship("StayCharge", back_populates="stay", cascade="all, delete-orphan")
-    payments = relationship("StayPayment", back_populates="stay", cascade="all, delete-orphan")
+    occupancies = relationship("StayRoomOccupancy", back_populates="stay", cascade="all, delete-orphan", passive_deletes=True)
+    charges = relationship("StayCharge", back_populates="stay", cascade="all, delete-orphan", passive_deletes=True)
+    payments = relationship("StayPayment", back_populates="stay", cascade="all, delete-orphan", passive_deletes=True)
     transactions = relationship("Transaction", back_populates="stay")
 
     def get_active_occupancy(self):
@@ -550,7 +570,7 @@ class StayRoomOccupancy(Base):
 
     motivo = Column(String(120), nullable=True)  # upgrade, mantenimiento, error, etc.
     creado_por = Column(String(50), nullable=True)
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     stay = relationship("Stay", back_populates="occupancies")
     room = relationship("Room")
@@ -576,7 +596,7 @@ class StayCharge(Base):
     monto_unitario = Column(Numeric(12, 2), nullable=False)
     monto_total = Column(Numeric(12, 2), nullable=False)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     creado_por = Column(String(50), nullable=True)
 
     stay = relationship("Stay", back_populates="charges")
@@ -589,7 +609,8 @@ class StayPayment(Base):
     __tablename__ = "stay_payments"
     __table_args__ = (
         Index("idx_payment_stay", "stay_id"),
-        Index("idx_payment_fecha", "timestamp"),
+        # Append-only: el orden físico sigue a timestamp, BRIN alcanza para rangos de fechas
+        Index("idx_payment_fecha", "timestamp", postgresql_using="brin"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -600,18 +621,44 @@ class StayPayment(Base):
     referencia = Column(String(120), nullable=True)
     es_reverso = Column(Boolean, default=False, nullable=False)
 
-    timestamp = Column(DateTime(timezone=True), default=utcnow)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
     usuario = Column(String(50), nullable=True)
     notas = Column(Text, nullable=True)
 
     stay = relationship("Stay", back_populates="payments")
 
 
+@event.listens_for(Session, "before_flush")
+def _sync_stay_monto_pagado(session, flush_context, instances):
+    """
+    Actualiza Stay.monto_pagado en la misma transacción que los pagos nuevos/borrados.
+    Los reversos no suman (igual que los saldos calculados en endpoints).
+    Para estadías ya persistidas se asigna una expresión SQL (monto_pagado + delta)
+    para que pagos concurrentes no se pisen.
+    """
+    deltas = {}
+    cambios = [(obj, 1) for obj in session.new] + [(obj, -1) for obj in session.deleted]
+    for pago, signo in cambios:
+        if not isinstance(pago, StayPayment) or pago.es_reverso or pago.monto is None:
+            continue
+        stay = pago.stay
+        if stay is None and pago.stay_id is not None:
+            stay = session.get(Stay, pago.stay_id)
+        if stay is None or stay in session.deleted:
+            continue
+        deltas[stay] = deltas.get(stay, Decimal("0")) + signo * Decimal(str(pago.monto))
+
+    for stay, delta in deltas.items():
+        if stay in session.new:
+            stay.monto_pagado = Decimal(str(stay.monto_pagado or 0)) + delta
+        else:
+            stay.monto_pagado = Stay.monto_pagado + delta
+
+
 class HKTemplate(Base):
     __tablename__ = "hk_templates"
     __table_args__ = (
         Index("idx_hkt_name", "nombre"),
-        Index("idx_hkt_empresa", "empresa_usuario_id"),
         UniqueConstraint("empresa_usuario_id", "nombre", name="uq_hk_template_empresa_nombre"),
     )
 
@@ -624,7 +671,7 @@ class HKTemplate(Base):
     minibar_default = Column(JSON, nullable=True)
 
     activo = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
 class HKRecurringRule(Base):
@@ -643,13 +690,12 @@ class HKRecurringRule(Base):
     prioridad = Column(String(10), nullable=False, default="media")
     activo = Column(Boolean, default=True, nullable=False)
     ultima_generacion = Column(Date, nullable=True)
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
 class HousekeepingTask(Base):
     __tablename__ = "housekeeping_tasks"
     __table_args__ = (
-        Index("idx_hk_task_room_date", "room_id", "task_date"),
         Index("idx_hk_task_status_date", "status", "task_date"),
         Index("idx_hk_task_empresa", "empresa_usuario_id"),
         # Una sola limpieza diaria por habitación y día
@@ -680,8 +726,8 @@ class HousekeepingTask(Base):
     notes = Column(Text, nullable=True)
     meta = Column(JSONB, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     room = relationship("Room")
     stay = relationship("Stay")
@@ -717,14 +763,14 @@ class HKCycle(Base):
     minibar_snapshot = Column(JSON, nullable=True)
     notas = Column(Text, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     room = relationship("Room")
     stay = relationship("Stay")
     template = relationship("HKTemplate")
-    incidents = relationship("HKIncident", back_populates="cycle", cascade="all, delete-orphan")
-    lost_items = relationship("HKLostItem", back_populates="cycle", cascade="all, delete-orphan")
+    incidents = relationship("HKIncident", back_populates="cycle", cascade="all, delete-orphan", passive_deletes=True)
+    lost_items = relationship("HKLostItem", back_populates="cycle", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class HKIncident(Base):
@@ -737,9 +783,9 @@ class HKIncident(Base):
     tipo = Column(String(50), nullable=False)
     gravedad = Column(String(10), nullable=False, default="media")
     descripcion = Column(Text, nullable=False)
-    fotos_url = Column(JSON, nullable=True)
+    fotos_url = Column(JSONB, nullable=True)  # ["https://...", ...]
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     created_by = Column(String(100), nullable=True)
 
     cycle = relationship("HKCycle", back_populates="incidents")
@@ -796,7 +842,7 @@ class MaintenanceTicket(Base):
     creado_por = Column(String(50), nullable=True)
     asignado_a = Column(String(100), nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     closed_at = Column(DateTime(timezone=True), nullable=True)
 
     room = relationship("Room")
@@ -819,7 +865,7 @@ class AuditEvent(Base):
     action = Column(String(50), nullable=False)  # CHECKIN, CHECKOUT, ROOM_MOVE, PAYMENT, UPDATE...
     usuario = Column(String(50), nullable=True)
 
-    timestamp = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     descripcion = Column(Text, nullable=True)
     payload = Column(JSONB, nullable=True)
     ip_address = Column(String(45), nullable=True)
@@ -833,7 +879,6 @@ class DailyCleanLog(Base):
     __tablename__ = "daily_clean_logs"
     __table_args__ = (
         UniqueConstraint("room_id", "date", name="uq_daily_clean_room_date"),
-        Index("idx_daily_clean_room", "room_id"),
         Index("idx_daily_clean_date", "date"),
     )
 
@@ -851,11 +896,10 @@ class HotelSettings(Base):
     __tablename__ = "hotel_settings"
     __table_args__ = (
         UniqueConstraint("empresa_usuario_id", name="uq_hotel_settings_empresa_usuario"),
-        Index("idx_hotel_settings_empresa", "empresa_usuario_id"),
     )
 
     id = Column(Integer, primary_key=True)
-    empresa_usuario_id = Column(Integer, ForeignKey("empresa_usuarios.id", ondelete="CASCADE"), nullable=False, unique=True)
+    empresa_usuario_id = Column(Integer, ForeignKey("empresa_usuarios.id", ondelete="CASCADE"), nullable=False)
     checkout_hour = Column(Integer, default=12, nullable=False)
     checkout_minute = Column(Integer, default=0, nullable=False)
     cleaning_start_hour = Column(Integer, default=10, nullable=False)
@@ -889,8 +933,8 @@ class HotelSettings(Base):
     stayover_policy = Column(String(20), default="diaria", nullable=False)
     stayover_cada_n_dias = Column(Integer, default=3, nullable=False)
 
-    created_at = Column(DateTime(timezone=True), default=utcnow)
-    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=utcnow)
 
     empresa_usuario = relationship("EmpresaUsuario", back_populates="hotel_settings")
 
@@ -922,7 +966,6 @@ class TransactionCategory(Base):
     __tablename__ = "transaction_categories"
     __table_args__ = (
         UniqueConstraint("empresa_usuario_id", "nombre", "tipo", name="uq_category_nombre_tipo"),
-        Index("idx_category_empresa", "empresa_usuario_id"),
         Index("idx_category_tipo", "tipo"),
     )
 
@@ -933,7 +976,7 @@ class TransactionCategory(Base):
     descripcion = Column(Text, nullable=True)
     activo = Column(Boolean, default=True, nullable=False)
     es_sistema = Column(Boolean, default=False, nullable=False)  # No editable/eliminable si es True
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     empresa_usuario = relationship("EmpresaUsuario", back_populates="transaction_categories")
@@ -980,7 +1023,7 @@ class Transaction(Base):
     notas = Column(Text, nullable=True)
     es_automatica = Column(Boolean, default=False, nullable=False)  # True si fue generada por checkout/stripe
     metadata_json = Column(JSONB, nullable=True)  # {breakdown: [...], invoice_details, etc}
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     empresa_usuario = relationship("EmpresaUsuario", back_populates="transactions")
@@ -1019,7 +1062,7 @@ class CashClosing(Base):
     diferencia = Column(Numeric(12, 2), nullable=False)  # efectivo_declarado - saldo_sistema
     
     notas = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), default=utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     empresa_usuario = relationship("EmpresaUsuario", back_populates="cash_closings")
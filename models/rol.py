@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from utils.datetime_utils import utcnow
@@ -14,34 +14,34 @@ class Rol(Base):
         Index("idx_rol_empresa", "empresa_usuario_id"),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
-    nombre = Column(String(50), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    nombre = Column(String(50), nullable=False)
     descripcion = Column(String(255), nullable=True)
     
     # Multi-tenant: NULL = rol global (super admin), otherwise = tenant-scoped
     empresa_usuario_id = Column(Integer, ForeignKey("empresa_usuarios.id", ondelete="CASCADE"), nullable=True)
     
     activo = Column(Boolean, default=True)
-    creado_en = Column(DateTime, default=utcnow)
-    actualizado_en = Column(DateTime, default=utcnow, onupdate=utcnow)
+    creado_en = Column(DateTime, server_default=text("timezone('utc', now())"))
+    actualizado_en = Column(DateTime, server_default=text("timezone('utc', now())"), onupdate=utcnow)
 
-    permisos = relationship("RolPermiso", back_populates="rol", cascade="all, delete-orphan")
-    usuarios = relationship("UsuarioRol", back_populates="rol", cascade="all, delete-orphan")
+    permisos = relationship("RolPermiso", back_populates="rol", cascade="all, delete-orphan", passive_deletes=True)
+    usuarios = relationship("UsuarioRol", back_populates="rol", cascade="all, delete-orphan", passive_deletes=True)
     empresa_usuario = relationship("EmpresaUsuario", back_populates="roles")
 
 
 class Permiso(Base):
     __tablename__ = "permisos"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     codigo = Column(String(100), unique=True, nullable=False, index=True)
     nombre = Column(String(100), nullable=False)
     descripcion = Column(String(255), nullable=True)
     activo = Column(Boolean, default=True)
-    creado_en = Column(DateTime, default=utcnow)
-    actualizado_en = Column(DateTime, default=utcnow, onupdate=utcnow)
+    creado_en = Column(DateTime, server_default=text("timezone('utc', now())"))
+    actualizado_en = Column(DateTime, server_default=text("timezone('utc', now())"), onupdate=utcnow)
 
-    roles = relationship("RolPermiso", back_populates="permiso", cascade="all, delete-orphan")
+    roles = relationship("RolPermiso", back_populates="permiso", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class RolPermiso(Base):
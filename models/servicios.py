@@ -4,7 +4,7 @@ Incluye: Tipos categorizados, control de activos, auditoría
 """
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Boolean, Numeric, Text, Index, ForeignKey
+    Column, Integer, String, DateTime, Boolean, Numeric, Text, Index, ForeignKey, text
 )
 from sqlalchemy.orm import relationship
 from database.conexion import Base
@@ -21,7 +21,7 @@ class ProductoServicio(Base):
         Index('idx_producto_empresa_usuario', 'empresa_usuario_id'),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     nombre = Column(String(100), nullable=False)
     tipo = Column(String(20), nullable=False)  # producto, servicio, descuento, extra
     descripcion = Column(Text, nullable=True)
@@ -34,8 +34,8 @@ class ProductoServicio(Base):
     activo = Column(Boolean, default=True)
     
     # Auditoría
-    creado_en = Column(DateTime, default=utcnow)
-    actualizado_en = Column(DateTime, default=utcnow, onupdate=utcnow)
+    creado_en = Column(DateTime, server_default=text("timezone('utc', now())"))
+    actualizado_en = Column(DateTime, server_default=text("timezone('utc', now())"), onupdate=utcnow)
     actualizado_por = Column(String(50), nullable=True)
     
     # Nota: En el nuevo modelo, los cargos se manejan a través de StayCharge
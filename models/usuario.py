@@ -1,7 +1,7 @@
 """
 Modelos de Usuario para autenticación y autorización
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from utils.datetime_utils import utcnow
@@ -13,13 +13,11 @@ class Usuario(Base):
     """Tabla de usuarios del sistema"""
     __tablename__ = "usuarios"
     __table_args__ = (
-        Index('idx_usuario_username', 'username'),
-        Index('idx_usuario_email', 'email'),
         Index('idx_usuario_activo', 'activo'),
         Index('idx_usuario_empresa_usuario', 'empresa_usuario_id'),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(100), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
@@ -43,8 +41,8 @@ class Usuario(Base):
     deleted = Column(Boolean, default=False, nullable=False)
     
     # Auditoría
-    fecha_creacion = Column(DateTime, default=utcnow, nullable=False)
-    fecha_ultima_modificacion = Column(DateTime, default=utcnow, onupdate=utcnow)
+    fecha_creacion = Column(DateTime, server_default=text("timezone('utc', now())"), nullable=False)
+    fecha_ultima_modificacion = Column(DateTime, server_default=text("timezone('utc', now())"), onupdate=utcnow)
     ultimo_login = Column(DateTime, nullable=True)
     
     # Seguridad
@@ -56,7 +54,7 @@ class Usuario(Base):
     reset_token_expires = Column(DateTime, nullable=True)
     
     # Relaciones
-    usuario_roles = relationship("UsuarioRol", back_populates="usuario", cascade="all, delete-orphan")
+    usuario_roles = relationship("UsuarioRol", back_populates="usuario", cascade="all, delete-orphan", passive_deletes=True)
     empresa_usuario = relationship("EmpresaUsuario", back_populates="usuarios")
     transactions_creadas = relationship("Transaction", foreign_keys="Transaction.usuario_id", back_populates="usuario")
     transactions_anuladas = relationship("Transaction", foreign_keys="Transaction.anulada_por_id", back_populates="anulada_por")
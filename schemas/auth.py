@@ -1,30 +1,61 @@
 """
 Schemas Pydantic para autenticación y autorización
 """
-from typing import Optional
+from typing import Annotated, Literal, Optional
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, StringConstraints, field_validator
+from schemas.base import ORMModel
+
+# En v2 Field() ignora strip_whitespace: se declara como restricción del tipo
+_Username = Annotated[str, StringConstraints(strip_whitespace=True, min_length=3, max_length=50)]
+
+# CUIT argentino: 11 dígitos, el último es verificador (módulo 11)
+_Cuit = Annotated[str, StringConstraints(pattern=r"^\d{11}$")]
+_CUIT_PESOS = (5, 4, 3, 2, 7, 6, 5, 4, 3, 2)
+
+# Roles asignables desde la API (pydantic-core valida el Literal por igualdad, sin regex)
+_Rol = Literal["admin", "gerente", "recepcionista", "readonly"]
 
 
 def _validate_password_strength(v: str) -> str:
     """Validación de fortaleza de contraseña reutilizable."""
-    if not any(c.isupper() for c in v):
+    # Una sola pasada; isupper/islower/isdigit aceptan cualquier letra Unicode (À, Ç, Ê...)
+    mayuscula = minuscula = digito = False
+    for c in v:
+        if c.isupper():
+            mayuscula = True
+        elif c.islower():
+            minuscula = True
+        elif c.isdigit():
+            digito = True
+        if mayuscula and minuscula and digito:
+            break
+    if not mayuscula:
         raise ValueError('La contraseña debe contener al menos una mayúscula')
-    if not any(c.islower() for c in v):
+    if not minuscula:
         raise ValueError('La contraseña debe contener al menos una minúscula')
-    if not any(c.isdigit() for c in v):
+    if not digito:
         raise ValueError('La contraseña debe contener al menos un número')
     return v
 
 
+def _validate_cuit_checksum(v: str) -> str:
+    """Verifica el dígito verificador del CUIT (el formato ya lo validó _Cuit)."""
+    resto = sum(int(d) * p for d, p in zip(v, _CUIT_PESOS)) % 11
+    verificador = 0 if resto == 0 else 11 - resto
+    if verificador == 10 or verificador != int(v[10]):
+        raise ValueError('CUIT inválido: dígito verificador incorrecto')
+    return v
+
+
 # ========== SCHEMAS DE USUARIO ==========
 
 class UsuarioBase(BaseModel):
-    username: str = Field(..., min_length=3, max_length=50, strip_whitespace=True)
+    username: _Username
     email: EmailStr
     nombre: Optional[str] = Field(None, max_length=60)
     apellido: Optional[str] = Field(None, max_length=60)
-    rol: str = Field(default="readonly", pattern="^(admin|gerente|recepcionista|readonly)$")
+    rol: _Rol = "readonly"
 
     @field_validator("username")
     @classmethod
@@ -47,11 +78,11 @@ class UsuarioUpdate(BaseModel):
     email: Optional[EmailStr] = None
     nombre: Optional[str] = Field(None, max_length=60)
     apellido: Optional[str] = Field(None, max_length=60)
-    rol: Optional[str] = Field(None, pattern="^(admin|gerente|recepcionista|readonly)$")
+    rol: Optional[_Rol] = None
     activo: Optional[bool] = None
 
 
-class UsuarioRead(BaseModel):
+class UsuarioRead(ORMModel):
     id: int
     username: str
     email: str
@@ -63,9 +94,6 @@ class UsuarioRead(BaseModel):
     es_super_admin: bool = False
     fecha_creacion: datetime
     ultimo_login: Optional[datetime]
-    
-    class Config:
-        from_attributes = True
 
 
 class UsuarioInDB(UsuarioRead):
@@ -73,9 +101,6 @@ class UsuarioInDB(UsuarioRead):
     deleted: bool
     intentos_fallidos: int
     bloqueado_hasta: Optional[datetime]
-    
-    class Config:
-        from_attributes = True
 
 
 # ========== SCHEMAS DE AUTENTICACIÓN ==========
@@ -127,10 +152,10 @@ class InviteUserRequest(BaseModel):
     email: EmailStr
     nombre: Optional[str] = Field(None, max_length=60)
     apellido: Optional[str] = Field(None, max_length=60)
-    rol: str = Field(default="recepcionista", pattern="^(admin|gerente|recepcionista|readonly)$")
+    rol: _Rol = "recepcionista"
 
 
-class InviteUserResponse(BaseModel):
+class InviteUserResponse(ORMModel):
     id: int
     username: str
     email: str
@@ -139,9 +164,6 @@ class InviteUserResponse(BaseModel):
     rol: str
     activo: bool
     temporal_password: str  # Contraseña temporal para el nuevo usuario
-    
-    class Config:
-        from_attributes = True
 
 
 class ResetPasswordResponse(BaseModel):
@@ -152,19 +174,16 @@ class ResetPasswordResponse(BaseModel):
 
 # ========== SCHEMAS MULTI-TENANT ==========
 
-class TrialStatusResponse(BaseModel):
+class TrialStatusResponse(ORMModel):
     """Información del estado del trial"""
     is_active: bool
     days_remaining: Optional[int]
     expires_at: Optional[str]
     status: str  # "active" | "expired" | "not_trial"
     message: str
-    
-    class Config:
-        from_attributes = True
 
 
-class EmpresaUsuarioResponse(BaseModel):
+class EmpresaUsuarioResponse(ORMModel):
     """Información pública de una empresa usuario (tenant)"""
     id: int
     nombre_hotel: str
@@ -173,12 +192,9 @@ class EmpresaUsuarioResponse(BaseModel):
     plan_tipo: str
     activa: bool
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 
-class SubscriptionResponse(BaseModel):
+class SubscriptionResponse(ORMModel):
     """Información de la suscripción SaaS"""
     id: int
     empresa_usuario_id: int
@@ -186,12 +202,9 @@ class SubscriptionResponse(BaseModel):
     estado: str  # "activo" | "vencido" | "cancelado" | "bloqueado"
     fecha_proxima_renovacion: Optional[datetime]
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 
-class MultiTenantLoginResponse(BaseModel):
+class MultiTenantLoginResponse(ORMModel):
     """Respuesta de login multi-tenant"""
     access_token: str
     refresh_token: str
@@ -202,15 +215,12 @@ class MultiTenantLoginResponse(BaseModel):
     empresa_usuario_id: Optional[int]
     es_super_admin: bool
     trial_status: Optional[TrialStatusResponse]
-    
-    class Config:
-        from_attributes = True
 
 
 class RegisterEmpresaUsuarioRequest(BaseModel):
     """Request para registrar nuevo hotel (SaaS signup)"""
     nombre_hotel: str = Field(..., min_length=3, max_length=150)
-    cuit: str = Field(..., pattern=r"^\d{11}$")  # CUIT argentino: 11 dígitos
+    cuit: _Cuit
     selected_plan: Optional[str] = Field(default="demo", description="Plan inicial: demo|basico|premium")
     
     contacto_nombre: str = Field(..., min_length=2, max_length=100)
@@ -221,10 +231,15 @@ class RegisterEmpresaUsuarioRequest(BaseModel):
     ciudad: str = Field(..., min_length=2, max_length=100)
     provincia: str = Field(..., min_length=2, max_length=100)
     
-    admin_username: str = Field(..., min_length=3, max_length=50, strip_whitespace=True)
+    admin_username: _Username
     admin_email: EmailStr
     admin_password: str = Field(..., min_length=8, max_length=72)
 
+    @field_validator("cuit")
+    @classmethod
+    def validate_cuit(cls, v: str) -> str:
+        return _validate_cuit_checksum(v)
+
     @field_validator("admin_password")
     @classmethod
     def validate_password(cls, v: str) -> str:
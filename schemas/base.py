@@ -0,0 +1,9 @@
+"""
+Bases compartidas para los schemas Pydantic
+"""
+from pydantic import BaseModel, ConfigDict
+
+
+class ORMModel(BaseModel):
+    """Schema de respuesta construible desde objetos ORM (model_validate(obj))"""
+    model_config = ConfigDict(from_attributes=True)
@@ -2,6 +2,7 @@
 Schemas para endpoints de Billing y Suscripciones
 """
 from pydantic import BaseModel, Field
+from schemas.base import ORMModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -14,7 +15,7 @@ class PlanType(str, Enum):
     PREMIUM = "premium"
 
 
-class PlanResponse(BaseModel):
+class PlanResponse(ORMModel):
     """Información pública de un plan"""
     id: int
     nombre: str
@@ -28,9 +29,6 @@ class PlanResponse(BaseModel):
     descripcion: Optional[str] = None
     features: List[str] = []
 
-    class Config:
-        from_attributes = True
-
 
 class SubscriptionInfo(BaseModel):
     """Información actual de suscripción"""
@@ -60,7 +58,7 @@ class TrialInfo(BaseModel):
     status: str  # 'active' | 'expired' | 'not_trial'
 
 
-class BillingStatusResponse(BaseModel):
+class BillingStatusResponse(ORMModel):
     """Respuesta de GET /billing/status"""
     current_plan: SubscriptionInfo
     trial_info: TrialInfo
@@ -68,9 +66,6 @@ class BillingStatusResponse(BaseModel):
     payment_method_configured: bool
     next_billing_date: Optional[datetime] = None
     total_spent: float = Field(default=0, ge=0)
-    
-    class Config:
-        from_attributes = True
 
 
 class UpgradePlanRequest(BaseModel):
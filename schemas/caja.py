@@ -1,11 +1,12 @@
 """
 Schemas Pydantic para el sistema de caja - Ingresos y Egresos
 """
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from utils.datetime_utils import utcnow
 from decimal import Decimal
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from schemas.base import ORMModel
 from enum import Enum
 
 
@@ -51,16 +52,13 @@ class TransactionCategoryUpdate(BaseModel):
     activo: Optional[bool] = None
 
 
-class TransactionCategoryResponse(TransactionCategoryBase):
+class TransactionCategoryResponse(TransactionCategoryBase, ORMModel):
     """Schema de respuesta para categoría"""
     id: int
     empresa_usuario_id: int
     es_sistema: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # ========== SCHEMAS DE TRANSACCIONES ==========
 
@@ -78,7 +76,8 @@ class TransactionCreate(TransactionBase):
     """Schema para crear una nueva transacción"""
     cliente_id: Optional[int] = None
     
-    @validator('monto')
+    @field_validator('monto')
+    @classmethod
     def validate_monto(cls, v):
         if v <= 0:
             raise ValueError('El monto debe ser mayor a 0')
@@ -98,7 +97,7 @@ class TransactionCreateAutomatic(BaseModel):
     notas: Optional[str] = None
 
 
-class TransactionResponse(TransactionBase):
+class TransactionResponse(TransactionBase, ORMModel):
     """Schema de respuesta para transacción"""
     id: int
     empresa_usuario_id: int
@@ -120,8 +119,9 @@ class TransactionResponse(TransactionBase):
     category_nombre: Optional[str] = None
     cliente_nombre: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+
+# Valida una lista completa de transacciones en una sola llamada a pydantic-core
+TransactionResponseListAdapter = TypeAdapter(List[TransactionResponse])
 
 
 class TransactionAnnul(BaseModel):
@@ -190,14 +190,15 @@ class CashClosingCreate(CashClosingBase):
     """Schema para crear un cierre de caja"""
     fecha_apertura: datetime = Field(..., description="Fecha y hora de apertura del turno")
     
-    @validator('efectivo_declarado')
+    @field_validator('efectivo_declarado')
+    @classmethod
     def validate_efectivo(cls, v):
         if v < 0:
             raise ValueError('El efectivo declarado no puede ser negativo')
         return v
 
 
-class CashClosingResponse(CashClosingBase):
+class CashClosingResponse(CashClosingBase, ORMModel):
     """Schema de respuesta para cierre de caja"""
     id: int
     empresa_usuario_id: int
@@ -213,9 +214,6 @@ class CashClosingResponse(CashClosingBase):
     # Datos relacionados
     usuario_nombre: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-
 
 # ========== SCHEMAS DE EXPORTACIÓN ==========
 
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from schemas.base import ORMModel
 from typing import List, Optional
 
 
@@ -19,12 +20,9 @@ class PermisoUpdate(BaseModel):
     activo: Optional[bool] = None
 
 
-class PermisoRead(PermisoBase):
+class PermisoRead(PermisoBase, ORMModel):
     id: int
 
-    class Config:
-        from_attributes = True
-
 
 class RolBase(BaseModel):
     nombre: str = Field(..., min_length=3, max_length=50)
@@ -43,17 +41,14 @@ class RolUpdate(BaseModel):
     permisos_codigos: Optional[List[str]] = None
 
 
-class RolRead(RolBase):
+class RolRead(RolBase, ORMModel):
     id: int
     permisos: List[PermisoRead] = []
 
-    class Config:
-        from_attributes = True
-
 
 class AsignarPermisosRequest(BaseModel):
-    permisos_codigos: List[str] = Field(..., min_items=1)
+    permisos_codigos: List[str] = Field(..., min_length=1)
 
 
 class AsignarRolesRequest(BaseModel):
-    roles_nombres: List[str] = Field(..., min_items=1)
+    roles_nombres: List[str] = Field(..., min_length=1)
@@ -1,7 +1,8 @@
 """Quick database check for calendar data"""
 from database.conexion import get_db
-from models.core import Stay, Reservation, ReservationRoom, Room
-from sqlalchemy import func
+from models.core import Stay, Reservation, ReservationRoom
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 
 def main():
     db = next(get_db())
@@ -13,22 +14,22 @@ def main():
         print(f"  Stay {s.id}: estado={s.estado}, reservation_id={s.reservation_id}, checkin={s.checkin_real}, checkout={s.checkout_real}")
     
     print("\n=== RESERVATIONS para tenant 17 ===")
-    reservations = db.query(Reservation).filter(Reservation.empresa_usuario_id == 17).limit(10).all()
+    # Habitaciones por selectinload: un SELECT ... IN en vez del join que repetía
+    # las columnas de la reserva por cada habitación.
+    reservations = db.query(Reservation).options(
+        selectinload(Reservation.rooms).joinedload(ReservationRoom.room)
+    ).filter(Reservation.empresa_usuario_id == 17).limit(10).all()
     print(f"Total reservations: {len(reservations)}")
     for r in reservations:
         print(f"  Reservation {r.id}: estado={r.estado}, checkin={r.fecha_checkin}, checkout={r.fecha_checkout}, nombre={r.nombre_temporal}")
+        for rr in r.rooms:
+            print(f"    RR {rr.id}: room_id={rr.room_id}, room_numero={rr.room.numero if rr.room else None}")
     
-    print("\n=== RESERVATION_ROOMS para tenant 17 ===")
-    rr_query = db.query(ReservationRoom, Room).join(Reservation).join(Room).filter(
-        Reservation.empresa_usuario_id == 17
-    ).limit(10).all()
-    print(f"Total reservation_rooms: {len(rr_query)}")
-    for rr, room in rr_query:
-        print(f"  RR {rr.id}: reservation_id={rr.reservation_id}, room_id={rr.room_id}, room_numero={room.numero}")
-    
-    # Summary
-    total_stays = db.query(func.count(Stay.id)).filter(Stay.empresa_usuario_id == 17).scalar()
-    total_reservations = db.query(func.count(Reservation.id)).filter(Reservation.empresa_usuario_id == 17).scalar()
+    # Summary (ambos conteos en una sola consulta)
+    total_stays, total_reservations = db.execute(select(
+        select(func.count(Stay.id)).where(Stay.empresa_usuario_id == 17).scalar_subquery(),
+        select(func.count(Reservation.id)).where(Reservation.empresa_usuario_id == 17).scalar_subquery(),
+    )).one()
     
     print(f"\n=== SUMMARY ===")
     print(f"Total stays: {total_stays}")
@@ -8,7 +8,7 @@ url = "http://localhost:8000/auth/register-empresa-usuario"
 
 data = {
     "nombre_hotel": "Hotel Test",
-    "cuit": "20304050607",
+    "cuit": "20304050609",
     "contacto_nombre": "Juan Perez",
     "contacto_email": "juan@test.com",
     "contacto_telefono": "1234567890",
@@ -2,7 +2,6 @@
 Script para ejecutar la migración 017 del sistema de caja
 """
 import psycopg2
-from psycopg2 import sql
 import os
 from dotenv import load_dotenv
 
@@ -42,45 +41,42 @@ def execute_migration():
         conn.commit()
         print("✅ Migración 017 ejecutada exitosamente")
         
-        # Verificar que las tablas fueron creadas
+        # Verificar tablas, enums y políticas RLS en una sola consulta (un round-trip
+        # en vez de tres SELECT seguidos)
         cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
+            SELECT 'tabla', table_name::text
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
             AND table_name IN ('transaction_categories', 'transactions', 'cash_closings')
-            ORDER BY table_name;
+            UNION ALL
+            SELECT 'enum', typname::text
+            FROM pg_type
+            WHERE typname IN ('transaction_type', 'payment_method')
+            UNION ALL
+            SELECT 'politica', tablename || '.' || policyname
+            FROM pg_policies
+            WHERE tablename IN ('transaction_categories', 'transactions', 'cash_closings')
+            ORDER BY 1, 2;
         """)
         
-        tables = cursor.fetchall()
+        verificados = {'tabla': [], 'enum': [], 'politica': []}
+        for tipo, nombre in cursor.fetchall():
+            verificados[tipo].append(nombre)
+        
+        tables = verificados['tabla']
         print(f"\n📊 Tablas creadas ({len(tables)}/3):")
         for table in tables:
-            print(f"  ✓ {table[0]}")
+            print(f"  ✓ {table}")
         
-        # Verificar enums creados
-        cursor.execute("""
-            SELECT typname 
-            FROM pg_type 
-            WHERE typname IN ('transaction_type', 'payment_method')
-            ORDER BY typname;
-        """)
-        
-        enums = cursor.fetchall()
+        enums = verificados['enum']
         print(f"\n🏷️  Enums creados ({len(enums)}/2):")
         for enum in enums:
-            print(f"  ✓ {enum[0]}")
-        
-        # Verificar políticas RLS
-        cursor.execute("""
-            SELECT tablename, policyname 
-            FROM pg_policies 
-            WHERE tablename IN ('transaction_categories', 'transactions', 'cash_closings')
-            ORDER BY tablename, policyname;
-        """)
+            print(f"  ✓ {enum}")
         
-        policies = cursor.fetchall()
+        policies = verificados['politica']
         print(f"\n🔒 Políticas RLS creadas ({len(policies)}/3):")
         for policy in policies:
-            print(f"  ✓ {policy[0]}.{policy[1]}")
+            print(f"  ✓ {policy}")
         
         cursor.close()
         conn.close()
@@ -2,12 +2,21 @@
 """
 Script para ejecutar migraciones SQL en la base de datos PostgreSQL
 Uso: python run_migrations_multitenant.py [--from 005 --to 008]
+
+Las migraciones aplicadas se registran en schema_migrations y se saltean en las
+corridas siguientes. En una base que ya tenía aplicadas 005-008 antes de existir el
+registro (re-ejecutarlas falla: CREATE TYPE/INDEX no son idempotentes), cargarlo sin
+ejecutar nada con:
+    python run_migrations_multitenant.py --mark-applied [--from 005 --to 008]
 """
 
 import os
 import sys
 import subprocess
+from bisect import bisect_left, bisect_right
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from database.conexion import engine
 import logging
@@ -25,16 +34,19 @@ logger = logging.getLogger(__name__)
 
 MIGRATIONS_DIR = Path(__file__).parent / "migrations"
 
-# Migraciones en orden
-MIGRATIONS = {
-    "005": "005_multitenant_core.sql",
-    "006": "006_add_tenant_id_all_tables.sql",
-    "007": "007_enable_rls_security.sql",
-    "008": "008_rename_subscription_metadata.sql",
-}
+# Migraciones en orden (la tupla ES el orden de ejecución: mantenerla ordenada)
+MIGRATIONS: tuple[tuple[str, str], ...] = (
+    ("005", "005_multitenant_core.sql"),
+    ("006", "006_add_tenant_id_all_tables.sql"),
+    ("007", "007_enable_rls_security.sql"),
+    ("008", "008_rename_subscription_metadata.sql"),
+)
+MIGRATION_NUMS = tuple(num for num, _ in MIGRATIONS)
+MIGRATION_FILES = dict(MIGRATIONS)
 
+@lru_cache(maxsize=1)
 def get_db_credentials():
-    """Obtiene credenciales de la base de datos del .env"""
+    """Obtiene credenciales de la base de datos del .env (una vez por proceso: no mutar el dict)"""
     return {
         "host": os.getenv("DB_HOST", "localhost"),
         "port": os.getenv("DB_PORT", "5432"),
@@ -45,7 +57,7 @@ def get_db_credentials():
 
 def execute_migration_with_psql(migration_num: str, credentials: dict):
     """Ejecuta migración usando psql directamente"""
-    migration_file = MIGRATIONS_DIR / MIGRATIONS[migration_num]
+    migration_file = MIGRATIONS_DIR / MIGRATION_FILES[migration_num]
     
     if not migration_file.exists():
         logger.error(f"Migration file not found: {migration_file}")
@@ -53,14 +65,18 @@ def execute_migration_with_psql(migration_num: str, credentials: dict):
     
     logger.info(f"Executing migration {migration_num}: {migration_file.name}")
     
-    # Construir comando psql
+    # Construir comando psql como argv (sin shell: nada que escapar en host/usuario/ruta).
+    # ON_ERROR_STOP hace que un statement fallido devuelva código != 0 en vez de seguir,
+    # y --single-transaction evita dejar la migración aplicada a medias.
     cmd = [
         "psql",
-        f"-h {credentials['host']}",
-        f"-p {credentials['port']}",
-        f"-U {credentials['user']}",
-        f"-d {credentials['database']}",
-        f"-f {str(migration_file)}"
+        "-h", credentials['host'],
+        "-p", str(credentials['port']),
+        "-U", credentials['user'],
+        "-d", credentials['database'],
+        "-v", "ON_ERROR_STOP=1",
+        "--single-transaction",
+        "-f", str(migration_file),
     ]
     
     try:
@@ -69,22 +85,31 @@ def execute_migration_with_psql(migration_num: str, credentials: dict):
         if credentials['password']:
             env['PGPASSWORD'] = credentials['password']
         
-        result = subprocess.run(
-            " ".join(cmd),
-            shell=True,
+        # Salida de psql (stdout + NOTICEs/errores de stderr) línea a línea al log,
+        # en vivo y sin acumularla en memoria hasta que termine el proceso. Se guardan
+        # las últimas líneas para volcarlas a nivel ERROR si la migración falla.
+        ultimas = deque(maxlen=20)
+        with subprocess.Popen(
+            cmd,
             env=env,
-            capture_output=True,
-            text=True
-        )
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        ) as proc:
+            for line in proc.stdout:
+                line = line.rstrip()
+                ultimas.append(line)
+                logger.info(f"psql: {line}")
+            returncode = proc.wait()
         
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info(f"Migration {migration_num} completed successfully")
-            if result.stdout:
-                logger.info(f"Output: {result.stdout}")
             return True
         else:
-            logger.error(f"Migration {migration_num} failed")
-            logger.error(f"Error: {result.stderr}")
+            logger.error(f"Migration {migration_num} failed (psql exit code {returncode})")
+            if ultimas:
+                logger.error("psql output (last lines):\n" + "\n".join(ultimas))
             return False
             
     except Exception as e:
@@ -93,7 +118,7 @@ def execute_migration_with_psql(migration_num: str, credentials: dict):
 
 def execute_migration_with_sqlalchemy(migration_num: str):
     """Ejecuta migración usando SQLAlchemy engine"""
-    migration_file = MIGRATIONS_DIR / MIGRATIONS[migration_num]
+    migration_file = MIGRATIONS_DIR / MIGRATION_FILES[migration_num]
     
     if not migration_file.exists():
         logger.error(f"Migration file not found: {migration_file}")
@@ -105,11 +130,12 @@ def execute_migration_with_sqlalchemy(migration_num: str):
         with open(migration_file, 'r', encoding='utf-8') as f:
             sql_content = f.read()
         
-        # Ejecutar SQL usando conexión raw para permitir múltiples statements y bloques $$
-        with engine.connect() as connection:
-            raw_conn = connection.connection
-            raw_conn.autocommit = True
-            with raw_conn.cursor() as cursor:
+        # Ejecutar SQL usando el cursor raw para permitir múltiples statements y bloques $$.
+        # La conexión sale del pool del engine: las migraciones siguientes reutilizan la
+        # misma sesión en vez de abrir una nueva. AUTOCOMMIT vía execution_options (y no
+        # tocando raw_conn.autocommit) para que el pool restaure el modo al devolverla.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            with connection.connection.cursor() as cursor:
                 cursor.execute(sql_content)
         
         logger.info(f"Migration {migration_num} completed successfully")
@@ -119,7 +145,30 @@ def execute_migration_with_sqlalchemy(migration_num: str):
         logger.error(f"Migration {migration_num} failed: {str(e)}")
         return False
 
-def run_migrations(from_num: str = "005", to_num: str = "008"):
+def _ensure_ledger():
+    """Crea la tabla de registro de migraciones si no existe"""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version text PRIMARY KEY,"
+            " applied_at timestamptz NOT NULL DEFAULT now())"
+        )
+
+def get_applied_migrations() -> set:
+    """Lee el registro de migraciones aplicadas"""
+    with engine.begin() as conn:
+        return set(conn.exec_driver_sql("SELECT version FROM schema_migrations").scalars())
+
+def mark_migration_applied(migration_num: str):
+    """Registra la migración como aplicada"""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO schema_migrations (version) VALUES (%s) ON CONFLICT DO NOTHING",
+            (migration_num,),
+        )
+
+def run_migrations(from_num: str = "005", to_num: str = "008", force: bool = False,
+                   mark_only: bool = False):
     """Ejecuta migraciones en rango"""
     logger.info("=" * 70)
     logger.info("STARTING MULTI-TENANT MIGRATIONS")
@@ -130,15 +179,32 @@ def run_migrations(from_num: str = "005", to_num: str = "008"):
     credentials = get_db_credentials()
     logger.info(f"Database: {credentials['database']} @ {credentials['host']}:{credentials['port']}")
     
-    migration_nums = sorted([k for k in MIGRATIONS.keys() if from_num <= k <= to_num])
+    # Rango por búsqueda binaria sobre los números ya ordenados
+    migration_nums = MIGRATION_NUMS[bisect_left(MIGRATION_NUMS, from_num):bisect_right(MIGRATION_NUMS, to_num)]
     
     if not migration_nums:
         logger.error(f"No migrations found in range {from_num} to {to_num}")
         return False
     
+    # La tabla se crea siempre (también con --force: mark_migration_applied la necesita);
+    # una sola consulta para saber qué ya corrió; --force re-ejecuta igual
+    _ensure_ledger()
+    
+    if mark_only:
+        for mig_num in migration_nums:
+            mark_migration_applied(mig_num)
+            logger.info(f"Migration {mig_num} marked as applied (not executed)")
+        return True
+    
+    applied = set() if force else get_applied_migrations()
+    
     failed = []
     
     for mig_num in migration_nums:
+        if mig_num in applied:
+            logger.info(f"Migration {mig_num} already applied - skipping")
+            continue
+        
         # Intentar con psql primero (más compatible con RLS)
         # Si falla, usar SQLAlchemy
         success = execute_migration_with_psql(mig_num, credentials)
@@ -151,6 +217,8 @@ def run_migrations(from_num: str = "005", to_num: str = "008"):
             failed.append(mig_num)
             logger.error(f"Migration {mig_num} FAILED - stopping here")
             break
+        
+        mark_migration_applied(mig_num)
     
     logger.info("=" * 70)
     if failed:
@@ -171,12 +239,16 @@ if __name__ == "__main__":
                         help="Ending migration number (default: 008)")
     parser.add_argument("--only", dest="only_num", 
                         help="Execute only this migration (e.g., 005)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run migrations even if already recorded in schema_migrations")
+    parser.add_argument("--mark-applied", "--baseline", dest="mark_applied", action="store_true",
+                        help="Record migrations in schema_migrations without executing them")
     
     args = parser.parse_args()
     
     if args.only_num:
-        success = run_migrations(args.only_num, args.only_num)
+        success = run_migrations(args.only_num, args.only_num, args.force, args.mark_applied)
     else:
-        success = run_migrations(args.from_num, args.to_num)
+        success = run_migrations(args.from_num, args.to_num, args.force, args.mark_applied)
     
     sys.exit(0 if success else 1)
@@ -100,7 +100,13 @@ class Test00_Setup:
         """Crea empresa + admin propio → token de tenant autónomo."""
         # CUIT must be 11 digits; use hex digits but keep only numeric portion
         cuit_digits = "".join(c for c in TAG if c.isdigit())[:8].ljust(8, "0")
-        cuit = f"20{cuit_digits}1"  # 2 + 8 + 1 = 11 digits
+        # Dígito verificador módulo 11; si da 10 se prueba otro prefijo (como AFIP)
+        for prefijo in ("20", "23", "27"):
+            base = f"{prefijo}{cuit_digits}"
+            resto = sum(int(d) * p for d, p in zip(base, (5, 4, 3, 2, 7, 6, 5, 4, 3, 2))) % 11
+            if resto != 1:
+                break
+        cuit = f"{base}{0 if resto == 0 else 11 - resto}"  # 2 + 8 + 1 = 11 digits
         payload = {
             "nombre_hotel":      f"Hotel Test {TAG}",
             "cuit":              cuit,
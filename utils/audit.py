@@ -0,0 +1,33 @@
+"""
+Auditoría diferida: los AuditEvent de un request se acumulan en la sesión y se
+insertan con un único INSERT multi-fila al hacer commit, sin pasar por el unit of
+work del ORM (son filas de solo escritura: nadie las lee en el mismo request).
+"""
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from models.core import AuditEvent
+
+_PENDIENTES = "audit_pendientes"
+
+
+def registrar_auditoria(db: Session, **campos) -> None:
+    """
+    Encola un evento de auditoría (mismos campos que AuditEvent). Se inserta en el
+    próximo db.commit(); si la transacción hace rollback se descarta.
+    """
+    if not db.in_transaction():
+        db.begin()  # que el rollback de esta transacción descarte lo encolado
+    db.info.setdefault(_PENDIENTES, []).append(campos)
+
+
+@event.listens_for(Session, "before_commit")
+def _insertar_auditoria_pendiente(session):
+    filas = session.info.pop(_PENDIENTES, None)
+    if filas:
+        session.execute(insert(AuditEvent), filas)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_auditoria_pendiente(session, previous_transaction):
+    session.info.pop(_PENDIENTES, None)
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from utils.datetime_utils import utcnow
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import text
+from sqlalchemy import lambda_stmt, select, text
 from sqlalchemy.orm import Session
 
 from database import conexion
@@ -58,12 +58,14 @@ async def get_current_user(
     except Exception:
         raise credentials_exception
     
-    # Buscar usuario en la base de datos
-    user = db.query(Usuario).filter(
-        Usuario.id == token_data.user_id,
-        Usuario.username == token_data.username,
+    # Buscar usuario en la base de datos. Corre en cada request autenticado:
+    # lambda_stmt cachea la construcción del SELECT, no solo su compilación.
+    user_id, username = token_data.user_id, token_data.username
+    user = db.execute(lambda_stmt(lambda: select(Usuario).where(
+        Usuario.id == user_id,
+        Usuario.username == username,
         Usuario.deleted.is_(False)
-    ).first()
+    ))).scalars().first()
     
     if user is None:
         raise credentials_exception
@@ -77,10 +79,11 @@ async def get_current_user(
 
     # Verificar tenant activo/no eliminado (excepto super admin)
     if not user.es_super_admin and user.empresa_usuario_id:
-        tenant = db.query(EmpresaUsuario).filter(
-            EmpresaUsuario.id == user.empresa_usuario_id,
+        tenant_id = user.empresa_usuario_id
+        tenant = db.execute(lambda_stmt(lambda: select(EmpresaUsuario).where(
+            EmpresaUsuario.id == tenant_id,
             EmpresaUsuario.deleted.is_(False)
-        ).first()
+        ))).scalars().first()
         if not tenant or not tenant.activa:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -257,15 +260,14 @@ async def get_current_user_optional(
 # ========== PERMISOS DINÁMICOS (RBAC) ==========
 
 def _user_permissions(db: Session, user_id: int):
-    perms = (
-        db.query(Permiso.codigo)
+    codigos = db.execute(lambda_stmt(lambda: (
+        select(Permiso.codigo)
         .join(RolPermiso, Permiso.id == RolPermiso.permiso_id)
         .join(UsuarioRol, UsuarioRol.rol_id == RolPermiso.rol_id)
-        .filter(UsuarioRol.usuario_id == user_id, Permiso.activo == True)
+        .where(UsuarioRol.usuario_id == user_id, Permiso.activo == True)
         .distinct()
-        .all()
-    )
-    return {p.codigo for p in perms}
+    ))).scalars()
+    return set(codigos)
 
 
 def require_permission(codigo_permiso: str):
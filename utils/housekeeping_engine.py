@@ -1,8 +1,43 @@
+import time
 from datetime import date, datetime
-from typing import Optional
+from typing import Optional, Tuple
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from models.core import Stay, HousekeepingTask
+from models.core import Stay, HousekeepingTask, HKTemplate
+
+# Caché en proceso de checklists de plantillas: se leen en cada generación de tareas
+# recurrentes y casi nunca cambian. Se invalida por evento ORM al editar/borrar la
+# plantilla; el TTL cubre ediciones hechas desde otro worker de gunicorn.
+_TEMPLATE_CACHE_TTL = 60  # segundos
+_template_checklists: dict = {}  # template_id -> (expira_en, empresa_usuario_id, nombres)
+
+
+def get_template_checklist(db: Session, template_id: int, tenant_id: int) -> Optional[Tuple[str, ...]]:
+    """
+    Devuelve los nombres de ítems del checklist de una plantilla del tenant, o None si la
+    plantilla no existe (o es de otro tenant).
+    """
+    hit = _template_checklists.get(template_id)
+    if hit and hit[0] > time.monotonic():
+        return hit[2] if hit[1] == tenant_id else None
+
+    tpl = db.query(HKTemplate).filter(HKTemplate.id == template_id).first()
+    if not tpl:
+        _template_checklists.pop(template_id, None)
+        return None
+    nombres = tuple(
+        (it.get("nombre") if isinstance(it, dict) else str(it)) for it in (tpl.checklist or [])
+    )
+    _template_checklists[template_id] = (time.monotonic() + _TEMPLATE_CACHE_TTL, tpl.empresa_usuario_id, nombres)
+    return nombres if tpl.empresa_usuario_id == tenant_id else None
+
+
+@event.listens_for(HKTemplate, "after_update")
+@event.listens_for(HKTemplate, "after_delete")
+def _invalidate_template_checklist(mapper, connection, target):
+    _template_checklists.pop(target.id, None)
+
 
 def generate_checkout_tasks(stay: Stay, db: Session) -> Optional[HousekeepingTask]:
     """